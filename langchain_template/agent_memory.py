@@ -0,0 +1,198 @@
+"""Bounded Conversation Memory for LangGraph Agents
+
+- Checkpointer factory: in-process MemorySaver or a disk-backed SQLite store
+  that prunes old checkpoints and evicts idle threads
+- History manager: a pre-model hook that keeps a token-budgeted window of
+  recent turns and folds older turns into a running summary
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+import tiktoken
+from langchain_core.messages import HumanMessage, RemoveMessage, SystemMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+SUMMARY_ID = "conversation-summary"
+
+
+# ===== CHECKPOINTER =====
+def _sqlite_saver_class():
+    # Optional dependency: only needed for AGENT_CHECKPOINTER=sqlite
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    class BoundedSqliteSaver(SqliteSaver):
+        """SqliteSaver that keeps only recent checkpoints and evicts idle threads.
+
+        - keep_checkpoints: checkpoints retained per thread (older ones are
+          only needed for time travel, which the agents don't use)
+        - max_threads: least recently used threads beyond this are deleted
+        - thread_ttl: threads idle for longer than this many seconds are deleted
+        """
+
+        def __init__(self, conn, keep_checkpoints=5, max_threads=100, thread_ttl=7 * 24 * 3600,
+                     evict_every=50, **kwargs):
+            super().__init__(conn, **kwargs)
+            self.keep_checkpoints = keep_checkpoints
+            self.max_threads = max_threads
+            self.thread_ttl = thread_ttl
+            self.evict_every = evict_every
+            self._puts = 0
+
+        def setup(self):
+            if self.is_setup:
+                return
+            super().setup()
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS thread_activity ("
+                "thread_id TEXT PRIMARY KEY, last_used REAL NOT NULL)"
+            )
+
+        def put(self, config, checkpoint, metadata, new_versions):
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            thread_id = str(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+            with self.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO thread_activity (thread_id, last_used) VALUES (?, ?) "
+                    "ON CONFLICT(thread_id) DO UPDATE SET last_used = excluded.last_used",
+                    (thread_id, time.time()),
+                )
+                for table in ("checkpoints", "writes"):
+                    cur.execute(
+                        f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? "
+                        "AND checkpoint_id NOT IN (SELECT checkpoint_id FROM checkpoints "
+                        "WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT ?)",
+                        (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.keep_checkpoints),
+                    )
+            self._puts += 1
+            if self._puts % self.evict_every == 0:
+                self.evict()
+            return next_config
+
+        def evict(self):
+            """Delete threads that are idle past the TTL or beyond max_threads"""
+            with self.cursor() as cur:
+                cur.execute(
+                    "SELECT thread_id FROM thread_activity WHERE last_used < ?",
+                    (time.time() - self.thread_ttl,),
+                )
+                stale = {row[0] for row in cur.fetchall()}
+                cur.execute(
+                    "SELECT thread_id FROM thread_activity ORDER BY last_used DESC LIMIT -1 OFFSET ?",
+                    (self.max_threads,),
+                )
+                stale.update(row[0] for row in cur.fetchall())
+            for thread_id in stale:
+                self.delete_thread(thread_id)
+
+        def delete_thread(self, thread_id):
+            super().delete_thread(thread_id)
+            with self.cursor() as cur:
+                cur.execute("DELETE FROM thread_activity WHERE thread_id = ?", (str(thread_id),))
+
+    return BoundedSqliteSaver
+
+
+def create_checkpointer(kind=None, path=None):
+    """Returns the checkpointer selected by AGENT_CHECKPOINTER ('memory' or 'sqlite')."""
+    kind = kind or os.getenv('AGENT_CHECKPOINTER', 'memory')
+    if kind == 'memory':
+        return MemorySaver()
+    if kind == 'sqlite':
+        path = path or os.getenv('AGENT_CHECKPOINT_DB', 'agent_memory.sqlite')
+        conn = sqlite3.connect(path, check_same_thread=False)
+        return _sqlite_saver_class()(
+            conn,
+            max_threads=int(os.getenv('AGENT_MAX_THREADS', '100')),
+            thread_ttl=float(os.getenv('AGENT_THREAD_TTL', 7 * 24 * 3600)),
+        )
+    raise ValueError(f"Unknown checkpointer: {kind}")
+
+
+# ===== HISTORY MANAGER =====
+def _encoding(model_name):
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def _message_text(message):
+    content = message.content
+    if isinstance(content, list):
+        content = " ".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        content += json.dumps([{"name": c["name"], "args": c["args"]} for c in tool_calls])
+    return content
+
+
+class HistoryManager:
+    """Pre-model hook that keeps per-turn prompt size flat.
+
+    When the conversation exceeds `max_tokens`, the oldest turns are folded
+    into a running summary (only the newly dropped turns are sent to the
+    summarizer) and removed from the stored state, leaving roughly
+    `keep_tokens` of recent turns. Cuts are only made at user turns, so a
+    tool call is never separated from its result.
+    """
+
+    def __init__(self, summary_model, max_tokens=3000, keep_tokens=1500, model_name="gpt-4o"):
+        self.summary_model = summary_model
+        self.max_tokens = max_tokens
+        self.keep_tokens = keep_tokens
+        self.encoding = _encoding(model_name)
+
+    def count_tokens(self, messages):
+        # ~4 tokens of per-message framing in the chat format
+        return sum(4 + len(self.encoding.encode(_message_text(m))) for m in messages)
+
+    def __call__(self, state):
+        messages = state["messages"]
+        summary = messages[0] if messages and messages[0].id == SUMMARY_ID else None
+        history = messages[1:] if summary else messages
+
+        if self.count_tokens(messages) <= self.max_tokens:
+            return {"llm_input_messages": messages}
+
+        cut = self._cut_index(history)
+        if cut == 0:
+            return {"llm_input_messages": messages}
+
+        summary = SystemMessage(
+            id=SUMMARY_ID,
+            content=self._summarize(summary.content if summary else "", history[:cut]),
+        )
+        kept = [summary, *history[cut:]]
+        return {
+            "messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *kept],
+            "llm_input_messages": kept,
+        }
+
+    def _cut_index(self, history):
+        """Earliest user-turn boundary whose suffix fits in keep_tokens"""
+        cut, tokens = None, 0
+        for i in range(len(history) - 1, -1, -1):
+            tokens += self.count_tokens([history[i]])
+            if isinstance(history[i], HumanMessage):
+                # Always keep the current turn, even if it alone is over budget
+                if cut is not None and tokens > self.keep_tokens:
+                    break
+                cut = i
+        return cut or 0
+
+    def _summarize(self, previous, dropped):
+        transcript = "\n".join(f"{m.type}: {_message_text(m)}" for m in dropped)
+        response = self.summary_model.invoke([
+            SystemMessage(content=(
+                "You maintain a running summary of a conversation. Extend the summary with "
+                "the new lines, keeping names, facts, numbers and open questions. "
+                "Reply with the updated summary only."
+            )),
+            HumanMessage(content=f"Current summary:\n{previous or '(none)'}\n\nNew lines:\n{transcript}"),
+        ])
+        return f"Summary of the earlier conversation:\n{response.content}"
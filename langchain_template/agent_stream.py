@@ -0,0 +1,94 @@
+"""Incremental Output for LangGraph Agent Loops
+
+Prints only what the current turn adds, as it happens:
+- Model tokens as they are generated (time-to-first-token is reported)
+- Tool calls and tool results at each ReAct step
+- Per-step timing for every graph node
+"""
+
+import time
+
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+
+MODEL_NODE = "agent"
+TOOL_NODE = "tools"
+TOOL_RESULT_PREVIEW = 300
+
+
+def _preview(text, limit=TOOL_RESULT_PREVIEW):
+    text = str(text)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def stream_turn(agent, input_message, config):
+    """Runs one turn with live output and returns its timings.
+
+    Returns a dict with `ttft` (seconds to the first model token, or None if
+    the model produced no text), `total` and a list of `(node, seconds)` steps.
+    """
+    started = time.perf_counter()
+    step_started = started
+    ttft = None
+    steps = []
+    printing_tokens = False
+    # Whether the model streamed text since its last update
+    streamed_text = False
+
+    for mode, payload in agent.stream(input_message, config=config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            chunk, metadata = payload
+            # The summarizer in the pre-model hook streams too; only echo the agent
+            if metadata.get("langgraph_node") != MODEL_NODE or not isinstance(chunk, AIMessageChunk):
+                continue
+            if isinstance(chunk.content, str) and chunk.content:
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                if not printing_tokens:
+                    print("🤖 AI: ", end="", flush=True)
+                    printing_tokens = True
+                print(chunk.content, end="", flush=True)
+                streamed_text = True
+            continue
+
+        now = time.perf_counter()
+        for node, update in payload.items():
+            if printing_tokens:
+                print()
+                printing_tokens = False
+            # Other nodes (e.g. the history pre-model hook) re-send existing
+            # messages, so only the agent and tool nodes report new ones
+            messages = update.get("messages", []) if node in (MODEL_NODE, TOOL_NODE) and isinstance(update, dict) else []
+            for message in messages:
+                if isinstance(message, AIMessage):
+                    # Models that don't stream tokens only deliver whole messages
+                    if not streamed_text and isinstance(message.content, str) and message.content:
+                        if ttft is None:
+                            ttft = now - started
+                        print(f"🤖 AI: {message.content}")
+                    for call in message.tool_calls:
+                        print(f"🔧 Tool: {call['name']}({call['args']})")
+                elif isinstance(message, ToolMessage):
+                    print(f"📎 {message.name}: {_preview(message.content)}")
+            if node == MODEL_NODE:
+                streamed_text = False
+            steps.append((node, now - step_started))
+            print(f"   ⏱ {node}: {now - step_started:.2f}s")
+        step_started = now
+
+    if printing_tokens:
+        print()
+    total = time.perf_counter() - started
+    print(f"   ⏱ turn: {total:.2f}s" + (f" (first token {ttft:.2f}s)" if ttft is not None else ""))
+    return {"ttft": ttft, "total": total, "steps": steps}
+
+
+def print_new_messages(response):
+    """Non-streaming fallback: pretty-print only the messages of the latest turn."""
+    messages = response["messages"]
+    start = 0
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], HumanMessage):
+            start = i
+            break
+    for message in messages[start:]:
+        message.pretty_print()
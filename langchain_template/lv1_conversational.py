@@ -6,17 +6,24 @@ from langchain.chat_models import init_chat_model
 
 # Load environment variables
 load_dotenv('.env')
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
+from agent_memory import HistoryManager, create_checkpointer
+from agent_stream import print_new_messages, stream_turn
 
 # Create the agent
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
-memory = MemorySaver()
+memory = create_checkpointer()  # AGENT_CHECKPOINTER=sqlite persists across restarts
 model = init_chat_model("openai:gpt-4", api_key=OPENAI_API_KEY)
-agent_executor = create_react_agent(model, checkpointer=memory, tools = [])
+summary_model = init_chat_model("openai:gpt-4o-mini", api_key=OPENAI_API_KEY)
+history = HistoryManager(summary_model, model_name="gpt-4")
+agent_executor = create_react_agent(model, checkpointer=memory, tools = [], pre_model_hook=history)
 
-config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+# AGENT_STREAM=0 prints each finished turn instead of streaming it
+STREAM_OUTPUT = os.getenv('AGENT_STREAM', '1') != '0'
+
+# Reuse AGENT_THREAD_ID to resume a persisted conversation
+config = {"configurable": {"thread_id": os.getenv('AGENT_THREAD_ID') or str(uuid.uuid4())}}
 
 # input_message = {
 #     "messages": [
@@ -46,6 +53,8 @@ while True:
         ]
     }
 
-    response = agent_executor.invoke(input_message, config=config)
-    for message in response["messages"]:
-        message.pretty_print()
+    if STREAM_OUTPUT:
+        stream_turn(agent_executor, input_message, config)
+    else:
+        response = agent_executor.invoke(input_message, config=config)
+        print_new_messages(response)
@@ -13,9 +13,12 @@ import uuid
 from dotenv import load_dotenv
 from langchain.chat_models import init_chat_model
 from langchain_tavily import TavilySearch
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
 from tools.test_tools import *
+from tools.async_tools import async_get_public_ip, async_get_city_by_ip
+from tools.graphrag_tool import graphrag_query
+from agent_memory import HistoryManager, create_checkpointer
+from agent_stream import print_new_messages, stream_turn
 
 # Load environment variables
 load_dotenv('.env')
@@ -23,17 +26,25 @@ load_dotenv('.env')
 # Environment variables
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 TAVILY_API_KEY = os.getenv('TAVILY_API_KEY')
+STREAM_OUTPUT = os.getenv('AGENT_STREAM', '1') != '0'  # 0 = print each finished turn
 
 # ===== AGENT SETUP =====
-memory = MemorySaver()
+memory = create_checkpointer()  # AGENT_CHECKPOINTER=sqlite persists across restarts
 model = init_chat_model("openai:gpt-4", api_key=OPENAI_API_KEY)
+summary_model = init_chat_model("openai:gpt-4o-mini", api_key=OPENAI_API_KEY)
+history = HistoryManager(summary_model, model_name="gpt-4")  # Token-budgeted window + running summary
 search = TavilySearch(max_results=2, api_key=TAVILY_API_KEY) # Web search tool
-tools = [search, calculator, get_time, get_public_ip, get_city_by_ip]
-agent_executor = create_react_agent(model, tools, checkpointer=memory) #Orchestrator
+# Network tools share one pooled HTTP client and a TTL cache; parallel tool
+# calls in a step run concurrently
+tools = [search, calculator, calculator_table, get_time, async_get_public_ip, async_get_city_by_ip]
+if os.getenv('NEO4j_URI'):
+    tools.append(graphrag_query)  # Drug-safety questions against the shared GraphRAG engine
+agent_executor = create_react_agent(model, tools, checkpointer=memory, pre_model_hook=history) #Orchestrator
 
 def main():
     """Main conversation loop."""
-    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    # Reuse AGENT_THREAD_ID to resume a persisted conversation
+    config = {"configurable": {"thread_id": os.getenv('AGENT_THREAD_ID') or str(uuid.uuid4())}}
     
     print("🤖 AI Agent ready! Available tools: calculator, time, IP lookup, search")
     print("💬 Type 'exit' to quit\n")
@@ -56,11 +67,12 @@ def main():
                 }]
             }
             
-            response = agent_executor.invoke(input_message, config=config)
-            
-            # Display all messages (user, tool calls, and AI responses)
-            for message in response["messages"]:
-                message.pretty_print()
+            if STREAM_OUTPUT:
+                # Live tokens, tool calls and step timings for this turn only
+                stream_turn(agent_executor, input_message, config)
+            else:
+                response = agent_executor.invoke(input_message, config=config)
+                print_new_messages(response)
                     
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
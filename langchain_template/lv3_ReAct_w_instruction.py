@@ -16,26 +16,34 @@ import uuid
 from dotenv import load_dotenv
 from langchain.chat_models import init_chat_model
 from langchain_tavily import TavilySearch
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
 
 from tools.test_tools import *
+from tools.async_tools import async_get_public_ip, async_get_city_by_ip
+from tools.graphrag_tool import graphrag_query
+from agent_memory import HistoryManager, create_checkpointer
+from agent_stream import print_new_messages, stream_turn
 # Load environment variables
 load_dotenv('.env')
 
 # Environment variables
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 TAVILY_API_KEY = os.getenv('TAVILY_API_KEY')
+STREAM_OUTPUT = os.getenv('AGENT_STREAM', '1') != '0'  # 0 = print each finished turn
 
 # ===== REACT AGENT SETUP =====
-memory = MemorySaver()
 model = init_chat_model("openai:gpt-4o", api_key=OPENAI_API_KEY, temperature=0.2)
 search = TavilySearch(max_results=2, api_key=TAVILY_API_KEY)  # Web search tool
-tools = [search, calculator, get_time, get_public_ip, get_city_by_ip]
+# Network tools share one pooled HTTP client and a TTL cache; parallel tool
+# calls in a step run concurrently
+tools = [search, calculator, calculator_table, get_time, async_get_public_ip, async_get_city_by_ip]
+if os.getenv('NEO4j_URI'):
+    tools.append(graphrag_query)  # Drug-safety questions against the shared GraphRAG engine
 
 SYSTEM_PROMPT = (
     "You are a helpful assistant. "
     "Break down complex tasks into logical steps when needed. "
+    "When several lookups don't depend on each other, request them together in one step. "
     "Provide accurate information and calculations. "
     "When greeting users who say hi, respond with 'Xin Chao'. "
     "Be direct and helpful in your responses. "
@@ -44,15 +52,20 @@ SYSTEM_PROMPT = (
 )
 
 # --- AGENT ---
-memory = MemorySaver()
-agent = create_react_agent(model=model, tools=tools, checkpointer=memory)
+memory = create_checkpointer()  # AGENT_CHECKPOINTER=sqlite persists across restarts
+summary_model = init_chat_model("openai:gpt-4o-mini", api_key=OPENAI_API_KEY)
+history = HistoryManager(summary_model, model_name="gpt-4o")  # Token-budgeted window + running summary
+# The system prompt is applied at call time instead of being stored in every turn
+agent = create_react_agent(model=model, tools=tools, checkpointer=memory,
+                           prompt=SYSTEM_PROMPT, pre_model_hook=history)
 
 # --- MAIN ---
 def main():
     print("ReAct Agent ready.")
     print("Type 'exit' to quit.\n")
 
-    thread_id = str(uuid.uuid4())
+    # Reuse AGENT_THREAD_ID to resume a persisted conversation
+    thread_id = os.getenv('AGENT_THREAD_ID') or str(uuid.uuid4())
     config = {"configurable": {"thread_id": thread_id}}
 
     while True:
@@ -63,15 +76,15 @@ def main():
         if not user_text:
             continue
 
-        response = agent.invoke(
-            {"messages": [("system", SYSTEM_PROMPT), ("user", user_text)]},
-            config=config
-        )
+        input_message = {"messages": [("user", user_text)]}
 
-        print("\n=== FULL CONVERSATION TRACE ===")
-        for message in response["messages"]:
-            message.pretty_print()
-        print("================================\n")
+        print("\n=== TURN TRACE ===")
+        if STREAM_OUTPUT:
+            stream_turn(agent, input_message, config)
+        else:
+            response = agent.invoke(input_message, config=config)
+            print_new_messages(response)
+        print("==================\n")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
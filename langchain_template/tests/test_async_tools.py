@@ -0,0 +1,99 @@
+"""Async network tools against the local stub server (no internet needed)
+
+Run from the repository root:
+    python -m pytest -q langchain_template/tests
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# The tools package lives in langchain_template/, next to tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import async_tools
+from tools.async_tools import TTLCache, async_get_city_by_ip, async_get_public_ip
+from tools.stub_server import STUB_IP, StubHandler, start_stub_server
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server, url = start_stub_server()
+    monkeypatch.setattr(async_tools, "IPIFY_URL", url)
+    monkeypatch.setattr(async_tools, "IPINFO_URL", url)
+    # Slow responses so parallel callers overlap while the first is in flight
+    monkeypatch.setattr(StubHandler, "delay", 0.2)
+    yield server
+    async_tools.close_http_client()
+    server.shutdown()
+
+
+def test_parallel_calls_share_one_request_per_endpoint(stub):
+    async def run():
+        return await asyncio.gather(
+            *[async_get_public_ip.ainvoke({}) for _ in range(5)],
+            *[async_get_city_by_ip.ainvoke({"ip": ""}) for _ in range(5)],
+        )
+
+    results = asyncio.run(run())
+
+    assert results[:5] == [f"Public IP: {STUB_IP}"] * 5
+    assert results[5:] == [f"Location for IP {STUB_IP}: San Francisco, US"] * 5
+    # One ipify and one ipinfo request, however many callers asked
+    assert stub.request_count == 2
+
+
+def test_repeated_calls_are_served_from_cache(stub):
+    assert async_get_city_by_ip.invoke({"ip": "198.51.100.1"}).endswith("San Francisco, US")
+    assert async_get_city_by_ip.invoke({"ip": "198.51.100.1"}).endswith("San Francisco, US")
+    assert asyncio.run(async_get_city_by_ip.ainvoke({"ip": "198.51.100.1"})).endswith("San Francisco, US")
+
+    assert stub.request_count == 1
+
+
+def test_cancelled_caller_does_not_break_other_callers(stub):
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(async_get_public_ip.ainvoke({}), 0.05)
+        return await async_get_public_ip.ainvoke({})
+
+    assert asyncio.run(run()) == f"Public IP: {STUB_IP}"
+    assert async_get_city_by_ip.invoke({"ip": ""}) == f"Location for IP {STUB_IP}: San Francisco, US"
+    # The cancelled caller's fetch kept running and was reused
+    assert stub.request_count == 2
+
+
+def test_cancelled_fetch_is_not_cached():
+    cache = TTLCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        if len(calls) == 1:
+            raise asyncio.CancelledError()
+        return "ok"
+
+    async def run():
+        with pytest.raises(asyncio.CancelledError):
+            await cache.get_or_fetch("key", fetch, ttl=60)
+        return await cache.get_or_fetch("key", fetch, ttl=60)
+
+    assert asyncio.run(run()) == "ok"
+    assert len(calls) == 2
+
+
+def test_cache_drops_oldest_entry_when_full():
+    cache = TTLCache(max_entries=2)
+
+    async def value(v):
+        return v
+
+    async def run():
+        for key in ("a", "b", "c"):
+            await cache.get_or_fetch(key, lambda key=key: value(key), ttl=60)
+
+    asyncio.run(run())
+
+    assert list(cache._entries) == ["b", "c"]
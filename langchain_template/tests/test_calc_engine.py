@@ -0,0 +1,83 @@
+"""Calculator engine limits and batch evaluation
+
+Run from the repository root:
+    python -m pytest -q langchain_template/tests
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.calc_engine import CalculatorError, evaluate, evaluate_batch
+from tools.test_tools import calculator, calculator_table
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("2+2", 4),
+    ("2**10", 1024),
+    ("5!", 120),
+    ("sqrt(16) + sin(pi/2)", 5.0),
+    ("round(3.14159, 2)", 3.14),
+    ("round(1234, -2)", 1200),
+    ("max([1, 5, 3])", 5),
+    ("sum([1, 2, 3])", 6),
+    ("min(4, 2, 8)", 2),
+])
+def test_evaluates_supported_expressions(expression, expected):
+    assert evaluate(expression) == expected
+
+
+@pytest.mark.parametrize("expression, message", [
+    ("9**9**9", "exponent exceeds limit"),
+    ("factorial(10**6)", "factorial argument exceeds limit"),
+    ("round(1, -10**7)", "ndigits exceeds limit"),
+    ("-" * 999 + "1", "nesting exceeds limit"),
+    ("1+" * 300 + "1", "nesting exceeds limit"),
+    ("[0]*10**7", "lists are only allowed"),
+    ("[1, 2] + [3]", "lists are only allowed"),
+    ("max([1, [2]])", "lists are only allowed"),
+    ("__import__('os')", "unsupported function"),
+    ("'a' * 3", "unsupported literal"),
+])
+def test_rejects_expressions_over_limits(expression, message):
+    started = time.monotonic()
+    with pytest.raises(CalculatorError, match=message):
+        evaluate(expression)
+    assert time.monotonic() - started < 1.0
+
+
+def test_errors_do_not_echo_values():
+    result = calculator.invoke({"expression": "[0]*10**7"})
+    assert result.startswith("Error:")
+    assert len(result) < 200
+
+
+def test_tool_never_raises():
+    assert calculator.invoke({"expression": "(" * 400 + "1" + ")" * 400}).startswith("Error:")
+    assert calculator.invoke({"expression": "-" * 999 + "1"}).startswith("Error:")
+
+
+def test_batch_broadcasts_scalars_against_arrays():
+    result = evaluate_batch("x**2 + y", {"x": [1, 2, 3], "y": 1})
+    np.testing.assert_array_equal(result, [2.0, 5.0, 10.0])
+
+
+def test_batch_returns_one_value_per_row_for_constants():
+    assert evaluate_batch("2 + 3", {}).shape == (1,)
+    assert evaluate_batch("2 + 3", {"x": [1, 2]}).shape == (2,)
+
+
+def test_batch_rejects_mismatched_lengths():
+    with pytest.raises(CalculatorError):
+        evaluate_batch("x + y", {"x": [1, 2, 3], "y": [1, 2]})
+
+
+def test_table_keeps_full_precision():
+    assert calculator_table.invoke({"expression": "x*2", "variables": {"x": [123456789]}}) == \
+        "x=123456789.0 -> 246913578.0"
+    assert calculator_table.invoke({"expression": "2 + 3", "variables": {}}) == "5.0"
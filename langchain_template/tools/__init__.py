@@ -1,5 +1,9 @@
 """Tools package for LangGraph agents."""
 
-from .test_tools import calculator, get_time, get_public_ip, get_city_by_ip, get_all_tools
+from .test_tools import calculator, calculator_table, get_time, get_public_ip, get_city_by_ip, get_all_tools
+from .async_tools import async_get_public_ip, async_get_city_by_ip, get_async_tools, close_http_client
+from .graphrag_tool import graphrag_query, close_engine
 
-__all__ = ['calculator', 'get_time', 'get_public_ip', 'get_city_by_ip', 'get_all_tools']
\ No newline at end of file
+__all__ = ['calculator', 'calculator_table', 'get_time', 'get_public_ip', 'get_city_by_ip', 'get_all_tools',
+           'async_get_public_ip', 'async_get_city_by_ip', 'get_async_tools', 'close_http_client',
+           'graphrag_query', 'close_engine']
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""Async Network Tools for LangGraph Agents
+
+Async versions of the network tools in test_tools:
+- One pooled httpx.AsyncClient shared by every call (keep-alive, HTTP/1.1 pooling)
+- TTL cache for public IP and geolocation lookups; concurrent callers asking
+  for the same key share the in-flight request
+- Usable from sync agents (ToolNode runs parallel tool calls on threads) and
+  async agents alike: all network I/O runs on one dedicated event loop
+
+Endpoints can be pointed at the local stub server via IPIFY_URL / IPINFO_URL.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+import time
+
+import httpx
+from langchain_core.tools import StructuredTool
+
+IPIFY_URL = os.getenv('IPIFY_URL', 'https://api.ipify.org')
+IPINFO_URL = os.getenv('IPINFO_URL', 'https://ipinfo.io')
+PUBLIC_IP_TTL = float(os.getenv('PUBLIC_IP_TTL', '300'))
+GEOLOCATION_TTL = float(os.getenv('GEOLOCATION_TTL', '86400'))
+HTTP_TIMEOUT = 5
+
+
+class TTLCache:
+    """Caches coroutine results for `ttl` seconds; only touched from the tools loop."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = {}
+
+    async def get_or_fetch(self, key, fetch, ttl):
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            # Shielded so a cancelled caller doesn't cancel the shared fetch
+            return await asyncio.shield(entry[1])
+        # Re-insert so entries stay ordered oldest first
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        task = asyncio.ensure_future(fetch())
+        self._entries[key] = (now + ttl, task)
+        task.add_done_callback(lambda done: self._evict_failed(key, done))
+        return await asyncio.shield(task)
+
+    def _evict_failed(self, key, task):
+        # Don't cache failures or cancellations
+        if (task.cancelled() or task.exception() is not None) and self._entries.get(key, (None, None))[1] is task:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+class _ToolsLoop:
+    """Background event loop owning the shared HTTP client and cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loop = None
+        self.client = None
+        self.cache = TTLCache()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self.loop is not None:
+                return
+            self.loop = asyncio.new_event_loop()
+            threading.Thread(target=self.loop.run_forever, name="tools-loop", daemon=True).start()
+            self.client = asyncio.run_coroutine_threadsafe(self._make_client(), self.loop).result()
+
+    async def _make_client(self):
+        return httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+
+    def submit(self, coro_fn, *args):
+        """Schedule `coro_fn(*args)` on the tools loop; returns a concurrent Future."""
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro_fn(*args), self.loop)
+
+    def run(self, coro_fn, *args):
+        return self.submit(coro_fn, *args).result()
+
+    async def arun(self, coro_fn, *args):
+        return await asyncio.wrap_future(self.submit(coro_fn, *args))
+
+    def close(self):
+        with self._lock:
+            if self.loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(self.client.aclose(), self.loop).result(timeout=HTTP_TIMEOUT)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop = None
+            self.client = None
+            self.cache.clear()
+
+
+_tools_loop = _ToolsLoop()
+atexit.register(_tools_loop.close)
+
+
+# ===== LOOKUPS (run on the tools loop) =====
+async def _public_ip():
+    async def fetch():
+        response = await _tools_loop.client.get(IPIFY_URL)
+        response.raise_for_status()
+        return response.text.strip()
+    return await _tools_loop.cache.get_or_fetch("public_ip", fetch, PUBLIC_IP_TTL)
+
+
+async def _location(ip):
+    async def fetch():
+        response = await _tools_loop.client.get(f"{IPINFO_URL}/{ip}/json")
+        response.raise_for_status()
+        return response.json()
+    return await _tools_loop.cache.get_or_fetch(("location", ip), fetch, GEOLOCATION_TTL)
+
+
+async def _public_ip_text(_=""):
+    try:
+        return f"Public IP: {await _public_ip()}"
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+async def _city_by_ip_text(ip=""):
+    try:
+        if not ip:
+            ip = await _public_ip()
+        data = await _location(ip)
+        city = data.get('city', 'Unknown')
+        country = data.get('country', 'Unknown')
+        return f"Location for IP {ip}: {city}, {country}"
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+# ===== TOOLS =====
+def _public_ip_sync(_: str = "") -> str:
+    return _tools_loop.run(_public_ip_text, _)
+
+
+async def _public_ip_async(_: str = "") -> str:
+    return await _tools_loop.arun(_public_ip_text, _)
+
+
+def _city_by_ip_sync(ip: str = "") -> str:
+    return _tools_loop.run(_city_by_ip_text, ip)
+
+
+async def _city_by_ip_async(ip: str = "") -> str:
+    return await _tools_loop.arun(_city_by_ip_text, ip)
+
+
+async_get_public_ip = StructuredTool.from_function(
+    func=_public_ip_sync,
+    coroutine=_public_ip_async,
+    name="get_public_ip",
+    description="Returns the public IP address using an external service.",
+)
+
+async_get_city_by_ip = StructuredTool.from_function(
+    func=_city_by_ip_sync,
+    coroutine=_city_by_ip_async,
+    name="get_city_by_ip",
+    description=(
+        "Returns the city for a given IP address.\n\n"
+        "If no IP is provided, uses the current public IP."
+    ),
+)
+
+
+def get_async_tools():
+    """Returns the network tools backed by the shared async client."""
+    return [async_get_public_ip, async_get_city_by_ip]
+
+
+def close_http_client():
+    """Closes the shared client and stops the tools loop (also runs at exit)."""
+    _tools_loop.close()
@@ -0,0 +1,371 @@
+"""Calculator Engine
+
+Parses expressions into a whitelisted AST, compiles them once into nested
+closures and evaluates the compiled form with resource limits:
+- Exponents, factorial arguments and integer result sizes are capped
+- Every evaluation runs against a time budget
+- Compiled expressions are memoized, so repeated inputs skip parsing
+- The same compiled form evaluates scalars (math) or whole arrays of
+  variable bindings at once (NumPy) for table-style workloads
+"""
+
+import ast
+import math
+import re
+import time
+from functools import lru_cache
+
+import numpy as np
+
+MAX_EXPONENT = 10_000          # |b| in a ** b
+MAX_FACTORIAL = 1_000          # n in factorial(n) / n!
+MAX_INT_BITS = 10_000          # integer results (~3,000 digits)
+MAX_ROUND_DIGITS = 1_000       # |ndigits| in round(x, ndigits)
+MAX_EXPRESSION_LENGTH = 1_000  # characters
+MAX_DEPTH = 100                # nesting of operators and calls
+MAX_BATCH_SIZE = 100_000       # rows in a batch evaluation
+TIME_BUDGET = 1.0              # seconds per evaluation
+
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+_FACTORIAL_NOTATION = re.compile(r'(\d+)!')
+
+
+class CalculatorError(ValueError):
+    """Raised for invalid expressions or when a resource limit is hit."""
+
+
+# ===== LIMIT CHECKS =====
+def _check_scalar(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        if value.bit_length() > MAX_INT_BITS:
+            raise CalculatorError("result magnitude exceeds limit")
+        return value
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise CalculatorError("result magnitude exceeds limit")
+        return value
+    if isinstance(value, complex):
+        raise CalculatorError("complex results are not supported")
+    raise CalculatorError(f"unsupported value of type {type(value).__name__}")
+
+
+def _check_array(value):
+    value = np.asarray(value, dtype=float)
+    if not np.all(np.isfinite(value)):
+        raise CalculatorError("result magnitude exceeds limit or is undefined")
+    return value
+
+
+def _scalar_pow(base, exponent):
+    if abs(exponent) > MAX_EXPONENT:
+        raise CalculatorError(f"exponent exceeds limit of {MAX_EXPONENT}")
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+        if base.bit_length() * exponent > MAX_INT_BITS + exponent:
+            raise CalculatorError("result magnitude exceeds limit")
+    try:
+        return base ** exponent
+    except OverflowError:
+        raise CalculatorError("result magnitude exceeds limit")
+
+
+def _scalar_mult(a, b):
+    if isinstance(a, int) and isinstance(b, int) and a.bit_length() + b.bit_length() > MAX_INT_BITS + 1:
+        raise CalculatorError("result magnitude exceeds limit")
+    return a * b
+
+
+def _scalar_factorial(n):
+    if isinstance(n, float) and n.is_integer():
+        n = int(n)
+    if not isinstance(n, int) or n < 0:
+        raise CalculatorError("factorial is only defined for non-negative integers")
+    if n > MAX_FACTORIAL:
+        raise CalculatorError(f"factorial argument exceeds limit of {MAX_FACTORIAL}")
+    return math.factorial(n)
+
+
+def _check_ndigits(ndigits):
+    if ndigits is None:
+        return None
+    # Batch evaluation hands over NumPy scalars and 0-d arrays
+    if np.ndim(ndigits) == 0 and not isinstance(ndigits, int) and float(ndigits).is_integer():
+        ndigits = int(ndigits)
+    if not isinstance(ndigits, int):
+        raise CalculatorError("round: ndigits must be an integer")
+    if abs(ndigits) > MAX_ROUND_DIGITS:
+        raise CalculatorError(f"round: ndigits exceeds limit of {MAX_ROUND_DIGITS}")
+    return ndigits
+
+
+def _scalar_round(x, ndigits=None):
+    return round(x, _check_ndigits(ndigits))
+
+
+def _array_round(x, ndigits=None):
+    return np.round(x, _check_ndigits(ndigits) or 0)
+
+
+def _array_pow(base, exponent):
+    if np.max(np.abs(exponent)) > MAX_EXPONENT:
+        raise CalculatorError(f"exponent exceeds limit of {MAX_EXPONENT}")
+    return np.power(np.asarray(base, dtype=float), exponent)
+
+
+def _array_factorial(n):
+    n = np.asarray(n, dtype=float)
+    if np.any(n < 0) or np.any(n != np.floor(n)):
+        raise CalculatorError("factorial is only defined for non-negative integers")
+    if np.any(n > MAX_FACTORIAL):
+        raise CalculatorError(f"factorial argument exceeds limit of {MAX_FACTORIAL}")
+    # float64 overflows past 170!, which the result check reports
+    return np.array([float(math.factorial(int(v))) if v <= 170 else math.inf for v in n.ravel()]).reshape(n.shape)
+
+
+def _array_log(x, base=None):
+    return np.log(x) if base is None else np.log(x) / np.log(base)
+
+
+def _reduce(fn):
+    # min/max/sum take either several arguments or one list
+    def reducer(*args):
+        items = args[0] if len(args) == 1 and isinstance(args[0], list) else list(args)
+        return fn(items)
+    return reducer
+
+
+# ===== BACKENDS =====
+SCALAR_OPS = {
+    "add": lambda a, b: a + b,
+    "sub": lambda a, b: a - b,
+    "mult": _scalar_mult,
+    "div": lambda a, b: a / b,
+    "floordiv": lambda a, b: a // b,
+    "mod": lambda a, b: a % b,
+    "pow": _scalar_pow,
+    "neg": lambda a: -a,
+    "check": _check_scalar,
+    "functions": {
+        "abs": abs, "round": _scalar_round, "pow": _scalar_pow,
+        "min": _reduce(min), "max": _reduce(max), "sum": _reduce(sum),
+        "sqrt": math.sqrt, "sin": math.sin, "cos": math.cos, "tan": math.tan,
+        "log": math.log, "log10": math.log10, "exp": math.exp,
+        "factorial": _scalar_factorial,
+    },
+}
+
+ARRAY_OPS = {
+    "add": np.add,
+    "sub": np.subtract,
+    "mult": np.multiply,
+    "div": np.true_divide,
+    "floordiv": np.floor_divide,
+    "mod": np.mod,
+    "pow": _array_pow,
+    "neg": np.negative,
+    "check": _check_array,
+    "functions": {
+        "abs": np.abs, "round": _array_round, "pow": _array_pow,
+        "min": _reduce(lambda xs: np.minimum.reduce(np.broadcast_arrays(*xs))),
+        "max": _reduce(lambda xs: np.maximum.reduce(np.broadcast_arrays(*xs))),
+        "sum": _reduce(lambda xs: np.add.reduce(np.broadcast_arrays(*xs))),
+        "sqrt": np.sqrt, "sin": np.sin, "cos": np.cos, "tan": np.tan,
+        "log": _array_log, "log10": np.log10, "exp": np.exp,
+        "factorial": _array_factorial,
+    },
+}
+
+# Only these accept a list literal, and only as a direct argument
+_LIST_FUNCTIONS = {"min", "max", "sum"}
+
+_BINARY_OPS = {
+    ast.Add: "add", ast.Sub: "sub", ast.Mult: "mult", ast.Div: "div",
+    ast.FloorDiv: "floordiv", ast.Mod: "mod", ast.Pow: "pow",
+}
+
+
+# ===== COMPILER =====
+class _Context:
+    __slots__ = ("ops", "env", "deadline")
+
+    def __init__(self, ops, env, deadline):
+        self.ops = ops
+        self.env = env
+        self.deadline = deadline
+
+    def tick(self):
+        if time.monotonic() > self.deadline:
+            raise CalculatorError("time budget exceeded")
+
+
+def _compile_node(node, variables, depth=0):
+    """Turns a whitelisted AST node into a closure taking a _Context."""
+    if depth > MAX_DEPTH:
+        raise CalculatorError(f"expression nesting exceeds limit of {MAX_DEPTH}")
+    depth += 1
+
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise CalculatorError(f"unsupported literal of type {type(node.value).__name__}")
+        value = node.value
+        return lambda ctx: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda ctx: value
+        if name in SCALAR_OPS["functions"]:
+            raise CalculatorError(f"function '{name}' must be called")
+        variables.add(name)
+
+        def load(ctx):
+            try:
+                return ctx.env[name]
+            except KeyError:
+                raise CalculatorError(f"unknown name: {name}")
+        return load
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        op = _BINARY_OPS[type(node.op)]
+        left = _compile_node(node.left, variables, depth)
+        right = _compile_node(node.right, variables, depth)
+
+        def binop(ctx):
+            a, b = left(ctx), right(ctx)
+            ctx.tick()
+            return ctx.ops["check"](ctx.ops[op](a, b))
+        return binop
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        operand = _compile_node(node.operand, variables, depth)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        return lambda ctx: ctx.ops["neg"](operand(ctx))
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        raise CalculatorError("lists are only allowed as arguments to min, max and sum")
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in SCALAR_OPS["functions"]:
+            raise CalculatorError(f"unsupported function: {ast.unparse(node.func)}")
+        if node.keywords:
+            raise CalculatorError("keyword arguments are not supported")
+        name = node.func.id
+        args = [
+            _compile_list(arg, variables, depth)
+            if name in _LIST_FUNCTIONS and isinstance(arg, (ast.List, ast.Tuple))
+            else _compile_node(arg, variables, depth)
+            for arg in node.args
+        ]
+
+        def call(ctx):
+            values = [arg(ctx) for arg in args]
+            ctx.tick()
+            try:
+                result = ctx.ops["functions"][name](*values)
+            except (ValueError, TypeError, ZeroDivisionError, OverflowError) as e:
+                if isinstance(e, CalculatorError):
+                    raise
+                raise CalculatorError(f"{name}: {str(e)}")
+            return ctx.ops["check"](result)
+        return call
+
+    raise CalculatorError(f"unsupported syntax: {type(node).__name__}")
+
+
+def _compile_list(node, variables, depth):
+    items = [_compile_node(item, variables, depth) for item in node.elts]
+    return lambda ctx: [item(ctx) for item in items]
+
+
+class CompiledExpression:
+    """An expression parsed and compiled once, evaluable many times."""
+
+    def __init__(self, source):
+        self.source = source
+        self.variables = set()
+        try:
+            tree = ast.parse(source, mode="eval")
+        except SyntaxError as e:
+            raise CalculatorError(f"invalid expression: {e.msg}")
+        except (RecursionError, MemoryError):
+            raise CalculatorError("expression is too deeply nested")
+        self._root = _compile_node(tree.body, self.variables)
+        self.variables = frozenset(self.variables)
+
+    def evaluate(self, variables=None, time_budget=TIME_BUDGET):
+        ctx = _Context(SCALAR_OPS, variables or {}, time.monotonic() + time_budget)
+        try:
+            return _check_scalar(self._root(ctx))
+        except ZeroDivisionError:
+            raise CalculatorError("division by zero")
+        except (TypeError, OverflowError) as e:
+            raise CalculatorError(str(e))
+        except (RecursionError, MemoryError):
+            raise CalculatorError("expression exceeds resource limits")
+
+    def evaluate_batch(self, bindings, time_budget=TIME_BUDGET):
+        """Evaluates over arrays of variable values in one vectorized pass."""
+        env = {name: np.asarray(values, dtype=float) for name, values in bindings.items()}
+        size = max((v.size for v in env.values()), default=1)
+        if size > MAX_BATCH_SIZE:
+            raise CalculatorError(f"batch exceeds limit of {MAX_BATCH_SIZE} rows")
+        ctx = _Context(ARRAY_OPS, env, time.monotonic() + time_budget)
+        with np.errstate(all="ignore"):
+            try:
+                result = self._root(ctx)
+            except ValueError as e:
+                if isinstance(e, CalculatorError):
+                    raise
+                raise CalculatorError(str(e))
+            except (RecursionError, MemoryError):
+                raise CalculatorError("expression exceeds resource limits")
+        # Always one value per row, including constant expressions
+        return np.broadcast_to(_check_array(result), (size,))
+
+
+def _normalize(expression):
+    expression = expression.strip()
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise CalculatorError(f"expression exceeds {MAX_EXPRESSION_LENGTH} characters")
+    # Handle factorial notation (5! -> factorial(5))
+    if '!' in expression:
+        expression = _FACTORIAL_NOTATION.sub(r'factorial(\1)', expression)
+    return expression
+
+
+@lru_cache(maxsize=1024)
+def _compile_cached(expression):
+    return CompiledExpression(expression)
+
+
+def compile_expression(expression):
+    """Returns the memoized compiled form of an expression."""
+    return _compile_cached(_normalize(expression))
+
+
+def evaluate(expression, variables=None, time_budget=TIME_BUDGET):
+    """Evaluates a single expression to an int or float."""
+    return compile_expression(expression).evaluate(variables, time_budget)
+
+
+def evaluate_many(expressions, time_budget=TIME_BUDGET):
+    """Evaluates independent expressions; failures are returned as CalculatorError."""
+    results = []
+    for expression in expressions:
+        try:
+            results.append(evaluate(expression, time_budget=time_budget))
+        except CalculatorError as e:
+            results.append(e)
+    return results
+
+
+def evaluate_batch(expression, bindings, time_budget=TIME_BUDGET):
+    """Evaluates one expression for many variable bindings at once.
+
+    Example: evaluate_batch("x**2 + y", {"x": [1, 2, 3], "y": 1}) -> [2., 5., 10.]
+    """
+    return compile_expression(expression).evaluate_batch(bindings, time_budget)
@@ -0,0 +1,155 @@
+"""Healthcare GraphRAG Tool for LangGraph Agents
+
+Lets the conversational agents answer adverse drug reaction questions from
+the Neo4j graph:
+- One shared, lazily built HealthcareGraphRAG engine (and Neo4j driver pool)
+  for every call instead of an engine per call
+- Compact results: the answer, the Cypher and a short row summary rather
+  than the full raw_results, to keep agent context small
+- Answers cached for a TTL; concurrent identical questions are coalesced by
+  the engine, and distinct ones run in parallel on the shared pool
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+from langchain_core.tools import StructuredTool
+
+# neo4j_service lives at the repository root, next to langchain_template/
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+GRAPHRAG_CACHE_TTL = float(os.getenv('GRAPHRAG_CACHE_TTL', '600'))
+GRAPHRAG_CACHE_MAX_ENTRIES = int(os.getenv('GRAPHRAG_CACHE_MAX_ENTRIES', '256'))
+MAX_SAMPLE_ROWS = 5
+MAX_VALUE_CHARS = 120
+
+_engine = None
+_engine_lock = threading.Lock()
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_engine():
+    """Returns the shared engine, building it on first use."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            from neo4j_service import HealthcareGraphRAG
+            _engine = HealthcareGraphRAG()
+        return _engine
+
+
+def close_engine():
+    """Closes the shared engine's Neo4j connections (also runs at exit)."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.close()
+            _engine = None
+
+
+atexit.register(close_engine)
+
+
+def _truncate(value):
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    if len(text) <= MAX_VALUE_CHARS:
+        return value
+    return text[:MAX_VALUE_CHARS] + "..."
+
+
+def summarize_result(result):
+    """Reduces an engine result to what the agent needs to answer."""
+    if result.get("error"):
+        return {"error": result["error"]}
+    rows = result.get("raw_results") or []
+    columns = list(rows[0].keys()) if rows else []
+    return {
+        "answer": result.get("answer"),
+        "cypher": result.get("cypher_query"),
+        "row_count": len(rows),
+        "columns": columns,
+        "sample_rows": [{k: _truncate(v) for k, v in row.items()} for row in rows[:MAX_SAMPLE_ROWS]],
+        "resolved_terms": [hit["term"] for hit in result.get("resolved_terms") or []],
+    }
+
+
+def _cache_key(question):
+    from neo4j_service.singleflight import normalize_question
+    return normalize_question(question)
+
+
+def _cached(key):
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        _cache.pop(key, None)
+    return None
+
+
+def _store(key, summary):
+    if "error" in summary:
+        return
+    with _cache_lock:
+        now = time.monotonic()
+        # Re-insert so entries stay ordered oldest first
+        _cache.pop(key, None)
+        if len(_cache) >= GRAPHRAG_CACHE_MAX_ENTRIES:
+            for expired in [k for k, entry in _cache.items() if entry[0] <= now]:
+                del _cache[expired]
+        while _cache and len(_cache) >= GRAPHRAG_CACHE_MAX_ENTRIES:
+            del _cache[next(iter(_cache))]
+        _cache[key] = (now + GRAPHRAG_CACHE_TTL, summary)
+
+
+def _query_graph(question: str) -> str:
+    try:
+        key = _cache_key(question)
+        summary = _cached(key)
+        if summary is None:
+            summary = summarize_result(get_engine().query(question))
+            _store(key, summary)
+        return json.dumps(summary, default=str)
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+async def _aquery_graph(question: str) -> str:
+    try:
+        key = _cache_key(question)
+        summary = _cached(key)
+        if summary is None:
+            engine = await _get_engine_async()
+            summary = summarize_result(await engine.aquery(question))
+            _store(key, summary)
+        return json.dumps(summary, default=str)
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+async def _get_engine_async():
+    if _engine is not None:
+        return _engine
+    # Importing the engine module can be slow; keep it off the event loop
+    return await asyncio.to_thread(get_engine)
+
+
+graphrag_query = StructuredTool.from_function(
+    func=_query_graph,
+    coroutine=_aquery_graph,
+    name="query_drug_safety_graph",
+    description=(
+        "Answers questions about adverse drug reactions from the FDA case report graph "
+        "(drugs, reactions, manufacturers, outcomes, patient age/gender). "
+        "Input is a natural-language question. Returns JSON with the answer, the Cypher "
+        "query used, the number of rows and a few sample rows."
+    ),
+)
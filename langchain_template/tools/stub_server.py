@@ -0,0 +1,70 @@
+"""Local Stub Server for the Network Tools
+
+Serves canned responses in the shapes of api.ipify.org and ipinfo.io so the
+network tools can be exercised without internet access:
+- GET /            -> public IP as plain text (ipify)
+- GET /<ip>/json   -> {"ip", "city", "region", "country"} (ipinfo)
+
+Set STUB_DELAY (seconds) to simulate latency and see concurrent dispatch.
+
+Usage:
+    python -m tools.stub_server 8765
+    IPIFY_URL=http://127.0.0.1:8765 IPINFO_URL=http://127.0.0.1:8765 python lv2_conversational_w_tools_customizable.py
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_IP = "203.0.113.7"
+STUB_LOCATION = {"city": "San Francisco", "region": "California", "country": "US"}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = float(os.getenv('STUB_DELAY', '0'))
+
+    def do_GET(self):
+        self.server.request_count += 1
+        if self.delay:
+            time.sleep(self.delay)
+
+        parts = [p for p in self.path.split('?')[0].split('/') if p]
+        if not parts:
+            self._send(200, "text/plain", STUB_IP)
+        elif len(parts) == 2 and parts[1] == "json":
+            self._send(200, "application/json", json.dumps({"ip": parts[0], **STUB_LOCATION}))
+        else:
+            self._send(404, "text/plain", "not found")
+
+    def _send(self, status, content_type, body):
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0):
+    """Starts the stub in a background thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.request_count = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server, url = start_stub_server(port)
+    print(f"Stub server on {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,17 +1,21 @@
 """Test Tools for LangGraph Agents
 
 A collection of tools for testing and demonstrating agent capabilities:
-- Calculator for mathematical expressions
+- Calculator for mathematical expressions (single or batched over a table of values)
 - Time retrieval
 - Public IP address lookup
 - City location by IP
 - Web search via Tavily
 """
 
-import math
-import re
 import time
+from typing import Dict, List
 from langchain_core.tools import tool
+try:
+    from .calc_engine import evaluate, evaluate_batch
+except ImportError:
+    # Running as a script from inside tools/
+    from calc_engine import evaluate, evaluate_batch
 
 
 @tool
@@ -22,27 +26,38 @@ def calculator(expression: str) -> str:
     Examples: 2+2, sqrt(16), 5!, sin(pi/2)
     """
     try:
-        # Safe evaluation namespace
-        safe_dict = {
-            "__builtins__": {},
-            "abs": abs, "round": round, "min": min, "max": max,
-            "sum": sum, "pow": pow,
-            "sqrt": math.sqrt, "sin": math.sin, "cos": math.cos, "tan": math.tan,
-            "log": math.log, "log10": math.log10, "exp": math.exp,
-            "pi": math.pi, "e": math.e, "factorial": math.factorial
-        }
-        
-        # Handle factorial notation (5! -> factorial(5))
-        if '!' in expression and 'factorial(' not in expression:
-            expression = re.sub(r'(\d+)!', r'factorial(\1)', expression)
-        
-        result = eval(expression, safe_dict)
+        # Parsed into a whitelisted AST with exponent, factorial, size and time limits
+        result = evaluate(expression)
         return f"Result: {result}"
     
     except Exception as e:
         return f"Error: {str(e)}"
 
 
+@tool
+def calculator_table(expression: str, variables: Dict[str, List[float]]) -> str:
+    """Evaluates one expression for many variable values at once.
+    
+    Use for tables, e.g. expression "p * (1 + r)**n" with
+    variables {"p": [1000], "r": [0.05], "n": [1, 2, 3, 4, 5]}.
+    Lists of length 1 are reused for every row.
+    """
+    try:
+        results = evaluate_batch(expression, variables)
+        names = sorted(variables)
+        rows = []
+        for i, result in enumerate(results):
+            values = ", ".join(
+                f"{name}={variables[name][i if len(variables[name]) > 1 else 0]}" for name in names
+            )
+            # Full precision; the agent should see the same digits as calculator
+            rows.append(f"{values} -> {float(result)!r}" if values else repr(float(result)))
+        return "\n".join(rows)
+    
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
 @tool
 def get_time() -> str:
     """Returns the current date and time."""
@@ -83,7 +98,7 @@ def get_city_by_ip(ip: str = "") -> str:
 
 def get_all_tools():
     """Returns a list of all available tools."""
-    return [calculator, get_time, get_public_ip, get_city_by_ip]
+    return [calculator, calculator_table, get_time, get_public_ip, get_city_by_ip]
 
 
 if __name__ == '__main__':
@@ -1,11 +1,170 @@
-from fastapi import FastAPI
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Response
+from pydantic import BaseModel
 import uvicorn
 
-app = FastAPI()
+
+class EngineState:
+    """Per-worker GraphRAG engine plus the bookkeeping behind the health checks"""
+    def __init__(self):
+        self.rag = None
+        self.ready = False
+        self.draining = False
+        self.warmup_timings = {}
+        self.error = None
+        # Misconfiguration (e.g. a missing API key) won't heal by retrying
+        self.fatal = False
+        self.warmup_attempts = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+
+engine = EngineState()
+
+
+class ConfigurationError(RuntimeError):
+    """The engine cannot be built with the current settings"""
+
+
+def _warmup():
+    """Build the engine and run its warmup; executed in each worker before it takes traffic"""
+    from neo4j_service import HealthcareGraphRAG
+
+    try:
+        rag = HealthcareGraphRAG()
+    except ValueError as e:
+        raise ConfigurationError(str(e)) from e
+    questions = [q.strip() for q in os.getenv('WARMUP_QUESTIONS', '').split('|') if q.strip()]
+    try:
+        engine.warmup_timings = rag.warmup(questions)
+    except Exception:
+        # Don't leak the half-built engine's driver pools into the next attempt
+        rag.close()
+        raise
+    engine.rag = rag
+
+
+async def _try_warmup() -> bool:
+    engine.warmup_attempts += 1
+    try:
+        await asyncio.to_thread(_warmup)
+    except ConfigurationError as e:
+        engine.error = str(e)
+        engine.fatal = True
+        print(f"GraphRAG is misconfigured, not retrying: {engine.error}")
+        return False
+    except Exception as e:
+        engine.error = str(e)
+        print(f"GraphRAG warmup failed (attempt {engine.warmup_attempts}): {engine.error}")
+        return False
+    engine.error = None
+    engine.ready = True
+    return True
+
+
+async def _retry_warmup():
+    """Keep retrying warmup with backoff until the dependencies come back"""
+    delay = float(os.getenv('WARMUP_RETRY_DELAY', '5'))
+    max_delay = float(os.getenv('WARMUP_RETRY_MAX_DELAY', '60'))
+    while not engine.draining:
+        await asyncio.sleep(delay)
+        if await _try_warmup() or engine.fatal:
+            return
+        delay = min(delay * 2, max_delay)
+
+
+async def _drain(timeout: float):
+    """Wait for in-flight questions to finish, up to `timeout` seconds"""
+    deadline = time.monotonic() + timeout
+    while engine.in_flight > 0 and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    retry_task = None
+    if os.getenv('GRAPHRAG_ENABLED', '1').lower() not in ('0', 'false', 'no', 'off'):
+        if not await _try_warmup() and not engine.fatal:
+            # Stay up but not-ready so the balancer routes around us, and keep
+            # retrying in the background until Neo4j/OpenAI are reachable
+            retry_task = asyncio.create_task(_retry_warmup())
+    else:
+        engine.ready = True
+    yield
+    engine.ready = False
+    engine.draining = True
+    if retry_task:
+        retry_task.cancel()
+    await _drain(float(os.getenv('DRAIN_TIMEOUT', '30')))
+    if engine.rag:
+        engine.rag.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+class Question(BaseModel):
+    question: str
+
 
 @app.get("/")
 def read_root():
     return {"content": "hello"}
 
+
+@app.get("/health/live")
+def liveness():
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+def readiness(response: Response):
+    if engine.ready:
+        status = "ready"
+    elif engine.draining:
+        status = "draining"
+    elif engine.fatal:
+        status = "misconfigured"
+    elif engine.error:
+        status = "failed"
+    else:
+        status = "starting"
+    if not engine.ready:
+        response.status_code = 503
+    return {
+        "status": status,
+        "error": engine.error,
+        "warmup_attempts": engine.warmup_attempts,
+        "in_flight": engine.in_flight,
+        "warmup": engine.warmup_timings,
+        # Identical concurrent questions answered by one pipeline run
+        "coalescing": engine.rag.inflight.metrics() if engine.rag else None,
+    }
+
+
+@app.post("/query")
+async def query(body: Question):
+    if not engine.ready or engine.rag is None:
+        raise HTTPException(status_code=503, detail="GraphRAG engine is not ready")
+    engine.enter()
+    try:
+        return await engine.rag.aquery(body.question)
+    finally:
+        engine.leave()
+
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
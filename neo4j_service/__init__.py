@@ -1,4 +1,18 @@
-from .service import Neo4jService
-from .graph_rag import HealthcareGraphRAG, ask_question
+import importlib
 
-__all__ = ['Neo4jService', 'HealthcareGraphRAG', 'ask_question']
\ No newline at end of file
+# Submodules are imported on first attribute access, so `import neo4j_service`
+# does not pull in LangChain, OpenAI or the Neo4j driver
+_EXPORTS = {
+    'Neo4jService': 'service',
+    'HealthcareGraphRAG': 'graph_rag',
+    'ask_question': 'graph_rag',
+}
+
+__all__ = ['Neo4jService', 'HealthcareGraphRAG', 'ask_question']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f'.{_EXPORTS[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
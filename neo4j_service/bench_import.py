@@ -0,0 +1,72 @@
+"""
+Cold-start benchmark: time fresh interpreters importing the package and
+reaching the CLI prompt, so regressions in import-time work show up.
+
+    python -m neo4j_service.bench_import --runs 7 --max-ms 300
+
+--max-ms fails (exit 1) when the CLI startup, minus bare interpreter
+startup, exceeds the budget.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The engine refuses to start without a key; nothing is sent to OpenAI here
+ENV = {**os.environ, "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY") or "bench"}
+
+CASES = [
+    ("python", "pass"),
+    ("import neo4j_service", "import neo4j_service"),
+    ("cli startup", (
+        "from neo4j_service import HealthcareGraphRAG\n"
+        "rag = HealthcareGraphRAG()\n"
+        "rag.get_database_summary()\n"
+        "rag.suggest_questions()"
+    )),
+    # What every startup paid before dependencies were loaded lazily
+    ("eager dependencies", (
+        "from neo4j_service.graph_rag import load_dependencies\n"
+        "load_dependencies()"
+    )),
+]
+
+
+def time_case(code: str, runs: int) -> float:
+    """Median wall time in ms of running `code` in a fresh interpreter"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True,
+                       stdout=subprocess.DEVNULL, env=ENV)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    timings = {}
+    for name, code in CASES:
+        try:
+            timings[name] = time_case(code, args.runs)
+        except subprocess.CalledProcessError:
+            print(f"{name:<22} failed")
+            continue
+        print(f"{name:<22} {timings[name]:8.1f} ms")
+
+    startup = timings.get("cli startup", 0) - timings.get("python", 0)
+    print(f"\nCLI startup over bare interpreter: {startup:.1f} ms")
+    if args.max_ms is not None and startup > args.max_ms:
+        print(f"Exceeds budget of {args.max_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
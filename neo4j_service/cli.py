@@ -9,7 +9,7 @@ def main():
     print("🏥 Healthcare Adverse Drug Reaction GraphRAG System")
     print("=" * 60)
     
-    # Initialize the system
+    # Initialize the system (connections and the QA chain are set up on the first question)
     try:
         rag = HealthcareGraphRAG()
         print("✅ System initialized successfully!")
@@ -53,6 +53,8 @@ def main():
             print(f"\n🔍 Analyzing: {question}")
             print("-" * 40)
             
+            if not rag.ready:
+                print("⏳ Connecting to Neo4j and loading the schema...")
             result = rag.query(question)
             
             if "error" in result:
@@ -1,46 +1,233 @@
+import copy
+import json
 import os
+import threading
+import time
 from typing import Dict, List, Any, Optional
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
-from langchain_community.chains.graph_qa.cypher import GraphCypherQAChain
-from langchain_community.graphs import Neo4jGraph
 from dotenv import load_dotenv
-from service import Neo4jService
+# LangChain, OpenAI, the Neo4j driver and NumPy are imported on first real
+# query so that importing this module (and commands like `summary`) stays fast
+try:
+    from .service import Neo4jService
+    from .resilience import Stage
+    from .singleflight import SingleFlight, normalize_question
+except ImportError:
+    # Running as a script from inside neo4j_service/
+    from service import Neo4jService
+    from resilience import Stage
+    from singleflight import SingleFlight, normalize_question
 
 load_dotenv()
 
+VOCAB_INDEX_PATH = os.getenv('VOCAB_INDEX_PATH', os.path.join(os.path.dirname(__file__), 'vocab_index.npz'))
+SCHEMA_CACHE_PATH = os.getenv('NEO4j_SCHEMA_CACHE', os.path.join(os.path.dirname(__file__), 'schema_cache.json'))
+SCHEMA_CACHE_TTL = float(os.getenv('NEO4j_SCHEMA_CACHE_TTL', 24 * 3600))
+
+def load_dependencies():
+    """Import the heavy query-time dependencies up front (e.g. before forking workers)"""
+    import neo4j  # noqa: F401
+    import langchain_openai  # noqa: F401
+    import langchain_core.prompts  # noqa: F401
+    import langchain_community.chains.graph_qa.cypher  # noqa: F401
+    _read_only_graph_class()
+    _vocab_index_module()
+
+def _vocab_index_module():
+    try:
+        from . import vocab_index
+    except ImportError:
+        import vocab_index
+    return vocab_index
+
+_read_only_graph = None
+
+def _read_only_graph_class():
+    """Define ReadOnlyNeo4jGraph on first use; subclassing needs langchain_community"""
+    global _read_only_graph
+    if _read_only_graph is not None:
+        return _read_only_graph
+    
+    from langchain_community.graphs import Neo4jGraph
+    from langchain_community.graphs.neo4j_graph import value_sanitize
+    
+    class ReadOnlyNeo4jGraph(Neo4jGraph):
+        """
+        Neo4jGraph whose schema introspection and generated Cypher run in
+        read-only sessions, so a routing driver can serve them from followers
+        and read replicas instead of the leader.
+        """
+        def __init__(self, service: Neo4jService, **kwargs):
+            self.service = service
+            # Server-side transaction timeout for queries, in seconds
+            self.timeout = None
+            super().__init__(**kwargs)
+            # Neo4jGraph opens its own pool just to verify connectivity; every
+            # query goes through the service's drivers, so release it
+            self._driver.close()
+        
+        def query(self, query: str, params: dict = {}) -> List[Dict[str, Any]]:
+            from neo4j import Query
+            with self.service.read_session() as session:
+                data = [record.data() for record in session.run(Query(query, timeout=self.timeout), params)]
+            if self.sanitize:
+                data = [value_sanitize(el) for el in data]
+            return data
+    
+    _read_only_graph = ReadOnlyNeo4jGraph
+    return _read_only_graph
+
 class HealthcareGraphRAG:
     def __init__(self):
+        # Checked up front so a missing key fails at startup, not on the first question
+        if not os.getenv('OPENAI_API_KEY'):
+            raise ValueError("OPENAI_API_KEY is not set")
         self.neo4j_service = Neo4jService()
-        self.llm = ChatOpenAI(
+        self.cypher_llm = None
+        self.answer_llm = None
+        self.graph = None
+        self.qa_chain = None
+        self.metadata = None
+        self.vocab_index = None
+        self.setup_error = None
+        # Per-stage deadlines in seconds; only the LLM stages are hedged since
+        # a duplicate Cypher execution just doubles database load
+        self.stages = {
+            "cypher": Stage.from_env("cypher", timeout=20.0, hedge=True),
+            "neo4j": Stage.from_env("neo4j", timeout=15.0),
+            "answer": Stage.from_env("answer", timeout=30.0, hedge=True),
+        }
+        # Concurrent identical questions share one computation
+        self.inflight = SingleFlight()
+        self._ready = False
+        self._ready_lock = threading.Lock()
+    
+    @property
+    def ready(self) -> bool:
+        """Whether connections and the QA chain have been set up"""
+        return self._ready
+    
+    def _ensure_ready(self):
+        """
+        Connect, load the schema and build the chain on first real use.
+        Raises if setup fails; the next call tries again.
+        """
+        if self._ready:
+            return
+        with self._ready_lock:
+            if self._ready:
+                return
+            self.setup_error = None
+            if self.cypher_llm is None:
+                self.cypher_llm = self._build_llm(self.stages["cypher"].timeout)
+                self.answer_llm = self._build_llm(self.stages["answer"].timeout)
+            self._setup_graph()
+            self._setup_qa_chain()
+            if not self.qa_chain:
+                raise RuntimeError(f"GraphRAG setup failed: {self.setup_error or 'QA chain not initialized'}")
+            self._load_vocab_index()
+            self._ready = True
+    
+    def _build_llm(self, timeout: float):
+        """Chat model that gives up with its stage, so abandoned calls free their worker"""
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(
             model="gpt-3.5-turbo",
             temperature=0,
-            api_key=os.getenv('OPENAI_API_KEY')
+            api_key=os.getenv('OPENAI_API_KEY'),
+            # Retries and deadlines are owned by the stage policies above
+            max_retries=0,
+            timeout=timeout
         )
-        self.graph = None
-        self.qa_chain = None
-        self._setup_graph()
-        self._setup_qa_chain()
     
     def _setup_graph(self):
         """Initialize the Neo4j graph connection for LangChain"""
+        cached = self._load_schema_cache()
         try:
-            self.graph = Neo4jGraph(
-                url=os.getenv('NEO4j_URI'),
+            self.graph = _read_only_graph_class()(
+                self.neo4j_service,
+                url=self.neo4j_service.uri,
                 username=os.getenv('NEO4j_USERNAME'),
-                password=os.getenv('NEO4j_PASSWORD')
+                password=os.getenv('NEO4j_PASSWORD'),
+                # A fresh cached schema skips the APOC introspection round trips
+                refresh_schema=cached is None
             )
+            # Set after construction so schema introspection is not cut short
+            self.graph.timeout = self.stages["neo4j"].timeout
+            if cached:
+                self.graph.schema = cached["schema"]
+                self.graph.structured_schema = cached["structured_schema"]
+            else:
+                self._save_schema_cache()
             print("Neo4j graph connection established for LangChain")
         except Exception as e:
+            self.setup_error = f"graph connection: {str(e)}"
             print(f"Failed to setup graph connection: {str(e)}")
     
+    def _load_schema_cache(self) -> Optional[Dict[str, Any]]:
+        """Return the persisted schema if it is fresh and for this database"""
+        try:
+            if time.time() - os.path.getmtime(SCHEMA_CACHE_PATH) > SCHEMA_CACHE_TTL:
+                return None
+            with open(SCHEMA_CACHE_PATH) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get("uri") != self.neo4j_service.uri:
+            return None
+        return cached
+    
+    def _save_schema_cache(self):
+        """Persist the introspected schema so later startups can skip it"""
+        tmp_path = f"{SCHEMA_CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({
+                    "uri": self.neo4j_service.uri,
+                    "schema": self.graph.schema,
+                    "structured_schema": self.graph.structured_schema
+                }, f)
+            os.replace(tmp_path, SCHEMA_CACHE_PATH)
+        except (OSError, TypeError) as e:
+            print(f"Failed to write schema cache: {str(e)}")
+    
+    def refresh_schema(self):
+        """Re-introspect the graph schema and update the persisted cache"""
+        self._ensure_ready()
+        self.graph.refresh_schema()
+        self._save_schema_cache()
+    
+    def _load_vocab_index(self):
+        """Load the offline-built vocabulary index if one exists"""
+        if not os.path.exists(VOCAB_INDEX_PATH):
+            return
+        try:
+            self.vocab_index = _vocab_index_module().VocabularyIndex.load(VOCAB_INDEX_PATH)
+            print(f"Vocabulary index loaded ({len(self.vocab_index)} terms)")
+        except Exception as e:
+            print(f"Failed to load vocabulary index: {str(e)}")
+    
+    def build_vocab_index(self):
+        """Embed the graph's Reaction and Drug vocabulary and persist it"""
+        self.vocab_index = _vocab_index_module().VocabularyIndex.build(self.neo4j_service)
+        nlist = int(os.getenv('VOCAB_IVF_LISTS', '0'))
+        if nlist:
+            self.vocab_index.train_ivf(nlist, nprobe=int(os.getenv('VOCAB_IVF_NPROBE', '4')))
+        self.vocab_index.save(VOCAB_INDEX_PATH)
+    
+    def resolve_terms(self, question: str) -> List[Dict[str, Any]]:
+        """Nearest Reaction/Drug terms for the phrases in a question"""
+        if not self.vocab_index:
+            return []
+        return self.vocab_index.resolve(question)
+    
     def _setup_qa_chain(self):
         """Setup the GraphRAG QA chain"""
         if not self.graph:
             return
         
+        from langchain_core.prompts import ChatPromptTemplate
+        from langchain_community.chains.graph_qa.cypher import GraphCypherQAChain
+        
         # Create enhanced Cypher generation prompt
         cypher_prompt = ChatPromptTemplate.from_messages([
             ("system", """
@@ -74,6 +261,7 @@ Guidelines:
 2. Use LIMIT for large result sets (default 10-20 unless asked for more)
 3. For drug names, use case-insensitive matching: toLower(d.name) CONTAINS toLower('drug_name')
 4. For reactions, use case-insensitive matching: toLower(r.description) CONTAINS toLower('reaction')
+   When a term below is resolved from the question, match its exact stored value instead of using CONTAINS
 5. Always return meaningful labels and aggregate data when possible
 6. Use COUNT, SUM, AVG for statistical queries
 7. Order results by relevance (count, date, etc.)
@@ -83,6 +271,9 @@ Examples:
 - To find drugs and their reaction counts: MATCH (d:Drug)<-[:IS_PRIMARY_SUSPECT]-(c:Case)-[:HAS_REACTION]->(r:Reaction) RETURN d.name, COUNT(r) as reaction_count ORDER BY reaction_count DESC LIMIT 10
 - To analyze by age/gender: MATCH (c:Case) RETURN c.gender, AVG(c.age) as avg_age, COUNT(c) as case_count
 
+Terms resolved from the question against the graph vocabulary:
+{resolved_terms}
+
 Generate only the Cypher query without explanation.
             """),
             ("human", "{question}")
@@ -90,7 +281,8 @@ Generate only the Cypher query without explanation.
         
         try:
             self.qa_chain = GraphCypherQAChain.from_llm(
-                llm=self.llm,
+                cypher_llm=self.cypher_llm,
+                qa_llm=self.answer_llm,
                 graph=self.graph,
                 verbose=True,
                 cypher_prompt=cypher_prompt,
@@ -100,42 +292,141 @@ Generate only the Cypher query without explanation.
             )
             print("GraphRAG QA chain setup complete")
         except Exception as e:
+            self.setup_error = f"QA chain: {str(e)}"
             print(f"Failed to setup QA chain: {str(e)}")
     
     def query(self, question: str) -> Dict[str, Any]:
         """
         Query the graph database and return comprehensive results
         """
-        if not self.qa_chain:
-            return {"error": "QA chain not initialized"}
-        
+        result = self.inflight.do(normalize_question(question), lambda: self._query(question))
+        return self._caller_result(result, question)
+    
+    async def aquery(self, question: str) -> Dict[str, Any]:
+        """
+        Async version of query; coalesces with both async and threaded callers
+        """
+        result = await self.inflight.do_async(normalize_question(question), lambda: self._query(question))
+        return self._caller_result(result, question)
+    
+    @staticmethod
+    def _caller_result(result: Dict[str, Any], question: str) -> Dict[str, Any]:
+        """Give each coalesced caller its own copy, so mutating one result can't change another"""
+        return {**copy.deepcopy(result), "question": question}
+    
+    def _query(self, question: str) -> Dict[str, Any]:
+        """Run the full GraphRAG pipeline for one question"""
         try:
-            # Get the full response with intermediate steps
-            response = self.qa_chain.invoke({"query": question})
-            
-            result = {
+            self._ensure_ready()
+        except Exception as e:
+            return {
                 "question": question,
-                "answer": response.get("result", "No answer generated"),
-                "cypher_query": None,
-                "raw_results": None
+                "error": str(e),
+                "answer": "I apologize, but the system is not available right now."
             }
+        
+        attempts = {}
+        resolved_terms = []
+        try:
+            resolved_terms = self.resolve_terms(question)
+            cypher_query = self.stages["cypher"].call(
+                lambda: self._generate_cypher(question, resolved_terms), attempts
+            )
+            
+            # Retrieve and limit the number of results
+            raw_results = []
+            if cypher_query:
+                raw_results = self.stages["neo4j"].call(
+                    lambda: self.graph.query(cypher_query)[:self.qa_chain.top_k], attempts
+                )
             
-            # Extract intermediate steps if available
-            if "intermediate_steps" in response:
-                steps = response["intermediate_steps"]
-                if steps and len(steps) > 0:
-                    result["cypher_query"] = steps[0].get("query", "No query generated")
-                    result["raw_results"] = steps[0].get("context", [])
+            answer = self.stages["answer"].call(lambda: self._generate_answer(question, raw_results), attempts)
             
-            return result
+            return {
+                "question": question,
+                "answer": answer or "No answer generated",
+                "cypher_query": cypher_query,
+                "raw_results": raw_results,
+                "resolved_terms": resolved_terms,
+                "attempts": attempts
+            }
             
         except Exception as e:
             return {
                 "question": question,
                 "error": f"Query failed: {str(e)}",
-                "answer": "I apologize, but I encountered an error while processing your question."
+                "answer": "I apologize, but I encountered an error while processing your question.",
+                "attempts": attempts
             }
     
+    def _generate_cypher(self, question: str, resolved_terms: List[Dict[str, Any]]) -> str:
+        """Run the chain's Cypher generation step"""
+        from langchain_community.chains.graph_qa.cypher import extract_cypher
+        chain = self.qa_chain
+        response = chain.cypher_generation_chain.invoke({
+            "question": question,
+            "schema": chain.graph_schema,
+            "resolved_terms": _vocab_index_module().format_resolved_terms(resolved_terms)
+        })
+        cypher_query = extract_cypher(response[chain.cypher_generation_chain.output_key])
+        if chain.cypher_query_corrector:
+            cypher_query = chain.cypher_query_corrector(cypher_query)
+        return cypher_query
+    
+    def _generate_answer(self, question: str, context: List[Dict[str, Any]]) -> str:
+        """Run the chain's answer step over the retrieved records"""
+        qa_chain = self.qa_chain.qa_chain
+        response = qa_chain.invoke({"question": question, "context": context})
+        return response[qa_chain.output_key]
+    
+    def warmup(self, questions: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Pay one-time startup costs before serving traffic: open the driver
+        pools, snapshot database metadata, render the prompt templates once
+        and optionally run a few questions to warm the LLM/Neo4j paths.
+        Returns the seconds spent in each phase.
+        """
+        timings = {}
+        
+        started = time.perf_counter()
+        self._ensure_ready()
+        timings["setup"] = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        if not self.neo4j_service.ensure_connected():
+            raise RuntimeError("Could not connect to Neo4j")
+        timings["connect"] = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        self.metadata = self.neo4j_service.get_metadata()
+        if self.metadata.get("error"):
+            raise RuntimeError(f"Metadata snapshot failed: {self.metadata['error']}")
+        timings["metadata"] = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        if not self.vocab_index:
+            try:
+                self.build_vocab_index()
+            except Exception as e:
+                print(f"Failed to build vocabulary index: {str(e)}")
+        timings["vocab_index"] = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        if self.qa_chain:
+            self.qa_chain.cypher_generation_chain.prompt.format_prompt(
+                question="warmup", schema=self.qa_chain.graph_schema,
+                resolved_terms=_vocab_index_module().format_resolved_terms(self.resolve_terms("warmup"))
+            )
+            self.qa_chain.qa_chain.prompt.format_prompt(question="warmup", context=[])
+        timings["templates"] = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        for question in questions or []:
+            self.query(question)
+        timings["preload"] = time.perf_counter() - started
+        
+        return timings
+    
     def get_database_summary(self) -> str:
         """Get a summary of the database for context"""
         summary = """
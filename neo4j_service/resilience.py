@@ -0,0 +1,210 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class StageTimeout(TimeoutError):
+    """Raised when a stage does not finish before its deadline"""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a stage is short-circuited by an open breaker"""
+
+
+@lru_cache(maxsize=None)
+def retryable_errors() -> Tuple[type, ...]:
+    """Collect the transient error types of the installed clients (on first failure)"""
+    errors = [StageTimeout, ConnectionError]
+    try:
+        from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+        errors += [ServiceUnavailable, SessionExpired, TransientError]
+    except ImportError:
+        pass
+    try:
+        from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+        errors += [APIConnectionError, APITimeoutError, InternalServerError, RateLimitError]
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+# Stage calls run on this pool so a deadline can be enforced from the caller.
+# A timed-out call keeps its worker until the client gives up on its own, so
+# callers must also give their clients a timeout (see Stage.timeout).
+_executor = ThreadPoolExecutor(max_workers=int(os.getenv('RESILIENCE_WORKERS', '32')),
+                               thread_name_prefix='graphrag-stage')
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    for `reset_timeout` seconds, then lets a single trial call through.
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies"""
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return the given percentile, or None until enough samples exist"""
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class Stage:
+    """
+    Runs one pipeline stage (an LLM call or a Neo4j query) with a deadline,
+    jittered exponential retries on transient errors, a circuit breaker and,
+    optionally, a hedged duplicate request once the call outlives the p95.
+    The deadline covers every attempt of the stage, including backoff.
+    """
+    def __init__(self, name: str, timeout: float = 30.0, max_retries: int = 2,
+                 base_delay: float = 0.5, max_delay: float = 8.0, hedge: bool = False,
+                 hedge_percentile: float = 95.0, breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+
+    @classmethod
+    def from_env(cls, name: str, timeout: float, hedge: bool = False) -> 'Stage':
+        """Build a stage whose settings can be overridden by GRAPHRAG_<NAME>_* variables"""
+        prefix = f"GRAPHRAG_{name.upper()}_"
+        hedge_env = os.getenv(prefix + 'HEDGE')
+        return cls(
+            name,
+            timeout=float(os.getenv(prefix + 'TIMEOUT', timeout)),
+            max_retries=int(os.getenv(prefix + 'RETRIES', os.getenv('GRAPHRAG_RETRIES', 2))),
+            hedge=hedge if hedge_env is None else hedge_env.lower() in ('1', 'true', 'yes', 'on'),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry number"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, fn: Callable[[], Any], attempts: Dict[str, int]) -> Any:
+        """
+        Call `fn` under this stage's policy. Every dispatched request,
+        including retries and hedges, is counted in `attempts[self.name]`.
+        """
+        attempts.setdefault(self.name, 0)
+        deadline = time.monotonic() + self.timeout
+        retry = 0
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"{self.name} circuit is open")
+            try:
+                result = self._call_once(fn, attempts, deadline)
+            except retryable_errors() as e:
+                self.breaker.record_failure()
+                if isinstance(e, StageTimeout) or retry >= self.max_retries:
+                    raise
+                delay = self.backoff(retry)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                time.sleep(delay)
+                retry += 1
+                continue
+            except Exception:
+                # Non-transient errors (bad Cypher, auth) are not the
+                # dependency's fault and should not trip the breaker
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def _call_once(self, fn: Callable[[], Any], attempts: Dict[str, int], deadline: float) -> Any:
+        started = time.monotonic()
+        attempts[self.name] += 1
+        futures = [_executor.submit(fn)]
+
+        hedge_delay = self.latency.percentile(self.hedge_percentile) if self.hedge else None
+        if hedge_delay is not None and started + hedge_delay < deadline:
+            done, _ = wait(futures, timeout=hedge_delay)
+            if not done:
+                attempts[self.name] += 1
+                futures.append(_executor.submit(fn))
+
+        pending = set(futures)
+        error = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                for other in pending:
+                    other.cancel()
+                self.latency.record(time.monotonic() - started)
+                return result
+        for future in pending:
+            future.cancel()
+        if pending or error is None:
+            raise StageTimeout(f"{self.name} exceeded its {self.timeout:.1f}s deadline")
+        raise error
+
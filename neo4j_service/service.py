@@ -1,47 +1,216 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
 from typing import Dict, List, Any, Optional
-from neo4j import GraphDatabase
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Same values as neo4j.READ_ACCESS / WRITE_ACCESS; the driver itself is
+# imported on connect so importing the package stays cheap
+READ_ACCESS = "READ"
+WRITE_ACCESS = "WRITE"
+
+# bolt:// talks to a single server; neo4j:// lets the driver route reads to
+# followers and read replicas and writes to the leader.
+ROUTING_SCHEMES = {
+    'bolt': 'neo4j',
+    'bolt+s': 'neo4j+s',
+    'bolt+ssc': 'neo4j+ssc',
+}
+
+
+def to_routing_uri(uri: str) -> str:
+    """Rewrite a direct bolt:// URI to its cluster-routing neo4j:// form"""
+    if not uri or '://' not in uri:
+        return uri
+    scheme, rest = uri.split('://', 1)
+    return f"{ROUTING_SCHEMES.get(scheme, scheme)}://{rest}"
+
+
+def _is_unavailable(error: Exception) -> bool:
+    """Whether a driver error means the endpoint itself is unreachable"""
+    from neo4j.exceptions import ServiceUnavailable, SessionExpired
+    return isinstance(error, (ServiceUnavailable, SessionExpired))
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
 class Neo4jService:
-    def __init__(self, uri: str = None):
+    def __init__(self, uri: str = None, read_uris: Optional[List[str]] = None,
+                 routing: Optional[bool] = None):
         self.uri = uri or os.getenv('NEO4j_URI')
         self.username = os.getenv('NEO4j_USERNAME')
         self.password = os.getenv('NEO4j_PASSWORD')
+        self.database = os.getenv('NEO4j_DATABASE') or None
+        if routing is None:
+            routing = _env_flag('NEO4j_ROUTING')
+        if routing:
+            self.uri = to_routing_uri(self.uri)
+        if read_uris is None:
+            read_uris = [u.strip() for u in os.getenv('NEO4j_READ_URIS', '').split(',') if u.strip()]
+        # Standalone replicas are addressed directly, never through routing
+        self.read_uris = read_uris
         self.driver = None
+        self.read_drivers = []
+        self.read_endpoints = []
+        self._read_load = []
+        # A replica that failed is skipped until this monotonic time
+        self._read_down_until = []
+        self.replica_cooldown = float(os.getenv('NEO4j_REPLICA_COOLDOWN', 30))
+        self._lock = threading.Lock()
+        # Serializes connect() so concurrent first queries open one set of drivers
+        self._connect_lock = threading.Lock()
         
     def connect(self):
         """Connect to Neo4j database"""
+        with self._connect_lock:
+            return self._connect()
+    
+    def ensure_connected(self) -> bool:
+        """Connect on first use; concurrent callers share a single connect"""
+        if self.driver:
+            return True
+        with self._connect_lock:
+            if self.driver:
+                return True
+            return self._connect()
+    
+    def _connect(self):
+        driver = None
         try:
-            self.driver = GraphDatabase.driver(
+            from neo4j import GraphDatabase
+            driver = GraphDatabase.driver(
                 self.uri, 
                 auth=(self.username, self.password)
             )
             # Test connection
-            with self.driver.session() as session:
+            with driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
                 session.run("RETURN 1")
-            return True
         except Exception as e:
+            if driver:
+                driver.close()
             print(f"Failed to connect to Neo4j: {str(e)}")
             return False
+        old_driver, self.driver = self.driver, driver
+        if old_driver:
+            old_driver.close()
+        self._connect_read_replicas()
+        return True
+    
+    def _connect_read_replicas(self):
+        """Open a driver per standalone read endpoint, skipping unreachable ones"""
+        from neo4j import GraphDatabase
+        self._close_read_replicas()
+        read_drivers = []
+        read_endpoints = []
+        for read_uri in self.read_uris:
+            try:
+                driver = GraphDatabase.driver(read_uri, auth=(self.username, self.password))
+                driver.verify_connectivity()
+                read_drivers.append(driver)
+                read_endpoints.append(read_uri)
+            except Exception as e:
+                print(f"Skipping read endpoint {read_uri}: {str(e)}")
+        # Swap in fresh lists rather than mutating; open sessions keep
+        # decrementing the lists they were counted in
+        with self._lock:
+            self.read_drivers = read_drivers
+            self.read_endpoints = read_endpoints
+            self._read_load = [0] * len(read_drivers)
+            self._read_down_until = [0.0] * len(read_drivers)
+    
+    def _close_read_replicas(self):
+        with self._lock:
+            drivers = self.read_drivers
+            self.read_drivers = []
+            self.read_endpoints = []
+            self._read_load = []
+            self._read_down_until = []
+        for driver in drivers:
+            driver.close()
     
     def close(self):
         """Close database connection"""
-        if self.driver:
-            self.driver.close()
+        with self._connect_lock:
+            self._close_read_replicas()
+            if self.driver:
+                self.driver.close()
+                self.driver = None
+    
+    @contextmanager
+    def read_session(self):
+        """
+        Open a read-only session on the least-loaded healthy read endpoint.
+
+        Falls back to the primary driver in READ mode, which a neo4j:// URI
+        routes to a follower or read replica. A replica that becomes
+        unavailable is skipped for `replica_cooldown` seconds, so retries go
+        to the primary instead of the same dead endpoint.
+        """
+        if not self.ensure_connected():
+            raise RuntimeError("Could not connect to database")
+        
+        with self._lock:
+            now = time.monotonic()
+            load, down_until = self._read_load, self._read_down_until
+            healthy = [i for i in range(len(self.read_drivers)) if down_until[i] <= now]
+            if healthy:
+                index = min(healthy, key=load.__getitem__)
+                load[index] += 1
+                driver = self.read_drivers[index]
+                endpoint = self.read_endpoints[index]
+            else:
+                index = None
+                driver = self.driver
+        try:
+            with driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
+                yield session
+        except Exception as e:
+            if index is not None and _is_unavailable(e):
+                print(f"Read replica {endpoint} unavailable, using primary for {self.replica_cooldown:.0f}s")
+                with self._lock:
+                    down_until[index] = time.monotonic() + self.replica_cooldown
+            raise
+        finally:
+            if index is not None:
+                with self._lock:
+                    load[index] -= 1
+    
+    @contextmanager
+    def write_session(self):
+        """Open a write session; always served by the leader"""
+        if not self.ensure_connected():
+            raise RuntimeError("Could not connect to database")
+        
+        with self.driver.session(database=self.database, default_access_mode=WRITE_ACCESS) as session:
+            yield session
+    
+    def run_read(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run a read-only query and return its records as dictionaries"""
+        with self.read_session() as session:
+            return [record.data() for record in session.run(query, params or {})]
+    
+    def run_write(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run a query that modifies the graph (ingestion) against the leader"""
+        with self.write_session() as session:
+            return [record.data() for record in session.run(query, params or {})]
     
     def get_metadata(self) -> Dict[str, Any]:
         """Get comprehensive metadata about the Neo4j database"""
-        if not self.driver:
-            if not self.connect():
-                return {"error": "Could not connect to database"}
+        if not self.ensure_connected():
+            return {"error": "Could not connect to database"}
         
         metadata = {}
         
         try:
-            with self.driver.session() as session:
+            with self.read_session() as session:
                 # Database info
                 metadata['database_info'] = self._get_database_info(session)
                 
@@ -0,0 +1,83 @@
+import asyncio
+import re
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+def normalize_question(question: str) -> str:
+    """Collapse case, whitespace and trailing punctuation so equivalent questions share a key"""
+    question = re.sub(r'\s+', ' ', question.strip().lower())
+    return question.rstrip(' ?!.')
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one in-flight
+    computation. The first caller (the leader) runs the work; everyone who
+    arrives before it finishes waits for and receives the same result.
+    Results are not cached once the flight lands.
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable):
+        """Return (future, is_leader) for `key`"""
+        with self._lock:
+            self.requests += 1
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.executions += 1
+            return future, True
+
+    def _run(self, key: Hashable, future: Future, fn: Callable[[], Any]):
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run `fn` for `key` from a thread, sharing any flight already underway"""
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, future, fn)
+        return future.result()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Awaitable variant for asyncio callers. The blocking `fn` runs on the
+        loop's default executor, and flights are shared with threaded callers.
+        """
+        future, leader = self._join(key)
+        if leader:
+            loop = asyncio.get_running_loop()
+            loop.run_in_executor(None, self._run, key, future, fn)
+        # shield so a cancelled waiter does not cancel the shared flight
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def metrics(self) -> Dict[str, int]:
+        """Counters for dashboards: requests seen, work executed, requests coalesced"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
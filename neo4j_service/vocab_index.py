@@ -0,0 +1,315 @@
+import os
+import re
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Common lay phrasings mapped to the MedDRA-style terms stored on Reaction
+# nodes. Hashed character features only catch spelling variants, so these
+# aliases are indexed as extra rows pointing at the canonical term.
+LAY_TERMS = {
+    "heart attack": "Myocardial infarction",
+    "stroke": "Cerebrovascular accident",
+    "liver damage": "Hepatotoxicity",
+    "liver injury": "Drug-induced liver injury",
+    "kidney failure": "Renal failure",
+    "kidney damage": "Renal impairment",
+    "high blood pressure": "Hypertension",
+    "low blood pressure": "Hypotension",
+    "high blood sugar": "Hyperglycaemia",
+    "low blood sugar": "Hypoglycaemia",
+    "irregular heartbeat": "Arrhythmia",
+    "racing heart": "Tachycardia",
+    "slow heartbeat": "Bradycardia",
+    "blood clot": "Thrombosis",
+    "clot in the lung": "Pulmonary embolism",
+    "throwing up": "Vomiting",
+    "feeling sick": "Nausea",
+    "upset stomach": "Dyspepsia",
+    "stomach pain": "Abdominal pain",
+    "shortness of breath": "Dyspnoea",
+    "trouble breathing": "Dyspnoea",
+    "hair loss": "Alopecia",
+    "skin rash": "Rash",
+    "itching": "Pruritus",
+    "hives": "Urticaria",
+    "swelling": "Oedema",
+    "dizzy": "Dizziness",
+    "fainting": "Syncope",
+    "passing out": "Syncope",
+    "seizure": "Convulsion",
+    "fits": "Convulsion",
+    "tiredness": "Fatigue",
+    "sleeplessness": "Insomnia",
+    "trouble sleeping": "Insomnia",
+    "depressed": "Depression",
+    "anxious": "Anxiety",
+    "memory loss": "Amnesia",
+    "confused": "Confusional state",
+    "bleeding": "Haemorrhage",
+    "nosebleed": "Epistaxis",
+    "bruising": "Contusion",
+    "fever": "Pyrexia",
+    "joint pain": "Arthralgia",
+    "muscle pain": "Myalgia",
+    "back pain": "Back pain",
+    "allergic reaction": "Hypersensitivity",
+    "severe allergic reaction": "Anaphylactic reaction",
+    "low white blood cells": "Neutropenia",
+    "low platelets": "Thrombocytopenia",
+    "low red blood cells": "Anaemia",
+    "pancreas inflammation": "Pancreatitis",
+    "death": "Death",
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "cause", "caused", "causes",
+    "common", "do", "does", "drug", "drugs", "for", "from", "have", "how", "i", "in", "is",
+    "it", "me", "most", "of", "on", "or", "patients", "reaction", "reactions", "report",
+    "reported", "show", "that", "the", "to", "what", "which", "who", "with", "adverse",
+    "many", "number", "top", "cases", "case",
+}
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', ' ', str(text).lower()).strip()
+
+
+class HashingEmbedder:
+    """
+    Dependency-free embedder: signed character n-gram counts hashed into a
+    fixed number of buckets, L2-normalized so dot products are cosines.
+    """
+    def __init__(self, dim: int = 1024, ngram_sizes=(3, 4)):
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+
+    @property
+    def name(self) -> str:
+        return f"hashing-{self.dim}-{'-'.join(map(str, self.ngram_sizes))}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            padded = f" {_normalize(text)} "
+            for n in self.ngram_sizes:
+                for i in range(len(padded) - n + 1):
+                    h = zlib.crc32(padded[i:i + n].encode())
+                    matrix[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model; understands synonyms, not just spellings"""
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    @property
+    def name(self) -> str:
+        return self.model_name
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+def get_embedder():
+    """Pick the embedder named by VOCAB_EMBEDDER ('hashing' or a local model name)"""
+    name = os.getenv('VOCAB_EMBEDDER', 'hashing')
+    if name != 'hashing':
+        try:
+            return SentenceTransformerEmbedder(name)
+        except ImportError:
+            print("sentence-transformers is not installed; using hashed features")
+    return HashingEmbedder()
+
+
+class VocabularyIndex:
+    """
+    Nearest-neighbour index over Reaction descriptions and Drug names.
+
+    Rows live in one dense float32 matrix so a question is resolved with a
+    single matrix product. For larger vocabularies an IVF partitioning
+    (k-means centroids + inverted lists) restricts the product to the rows
+    in the `nprobe` closest partitions.
+    """
+    def __init__(self, labels, ids, terms, texts, matrix: np.ndarray, embedder=None):
+        self.labels = np.asarray(labels, dtype=object)
+        self.ids = np.asarray(ids, dtype=object)
+        self.terms = np.asarray(terms, dtype=object)
+        self.texts = np.asarray(texts, dtype=object)
+        self.matrix = matrix
+        self.embedder = embedder or HashingEmbedder()
+        self.centroids = None
+        self.assignments = None
+        self.nprobe = 1
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @classmethod
+    def build(cls, service, embedder=None) -> 'VocabularyIndex':
+        """Embed every Reaction and Drug in the graph, plus lay aliases for known terms"""
+        embedder = embedder or get_embedder()
+        rows = []
+        for record in service.run_read(
+            "MATCH (r:Reaction) WHERE r.description IS NOT NULL RETURN r.id AS id, r.description AS term"
+        ):
+            rows.append(("Reaction", record["id"], record["term"], record["term"]))
+        for record in service.run_read(
+            "MATCH (d:Drug) WHERE d.name IS NOT NULL RETURN d.id AS id, d.name AS term"
+        ):
+            rows.append(("Drug", record["id"], record["term"], record["term"]))
+
+        by_term = {_normalize(term): (label, id_, term) for label, id_, term, _ in rows if label == "Reaction"}
+        for alias, canonical in LAY_TERMS.items():
+            match = by_term.get(_normalize(canonical))
+            if match:
+                rows.append((match[0], match[1], match[2], alias))
+
+        labels, ids, terms, texts = zip(*rows) if rows else ((), (), (), ())
+        return cls(labels, ids, terms, texts, embedder.embed(list(texts)), embedder)
+
+    def train_ivf(self, nlist: int, nprobe: int = 4, iterations: int = 10, seed: int = 0):
+        """Partition rows with spherical k-means into `nlist` inverted lists"""
+        nlist = min(nlist, len(self))
+        rng = np.random.default_rng(seed)
+        centroids = self.matrix[rng.choice(len(self), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(self.matrix @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = self.matrix[assignments == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[c] = centroid / (np.linalg.norm(centroid) or 1.0)
+        self.centroids = centroids
+        self.assignments = np.argmax(self.matrix @ centroids.T, axis=1)
+        self.nprobe = nprobe
+
+    def _candidate_rows(self, queries: np.ndarray) -> Optional[np.ndarray]:
+        """Rows in the partitions nearest to any query, or None to scan everything"""
+        if self.centroids is None:
+            return None
+        nprobe = min(self.nprobe, len(self.centroids))
+        probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        return np.flatnonzero(np.isin(self.assignments, np.unique(probes)))
+
+    def search(self, texts: List[str], k: int = 5) -> List[List[Dict[str, Any]]]:
+        """Top-k rows for each text, as lists of {label, id, term, text, score}"""
+        if not texts or not len(self):
+            return [[] for _ in texts]
+        queries = self.embedder.embed(texts)
+        rows = self._candidate_rows(queries)
+        scores = queries @ (self.matrix if rows is None else self.matrix[rows]).T
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for q, candidates in enumerate(top):
+            ordered = candidates[np.argsort(-scores[q, candidates])]
+            results.append([self._hit(ordered_row if rows is None else rows[ordered_row], scores[q, ordered_row])
+                            for ordered_row in ordered])
+        return results
+
+    def _hit(self, row: int, score: float) -> Dict[str, Any]:
+        return {
+            "label": self.labels[row],
+            "id": self.ids[row],
+            "term": self.terms[row],
+            "text": self.texts[row],
+            "score": float(score),
+        }
+
+    def resolve(self, question: str, k: int = 5, min_score: float = 0.55) -> List[Dict[str, Any]]:
+        """
+        Map the phrases of a question to graph vocabulary. Every 1-4 word
+        span is embedded in one batch and matched against the index; the
+        best-scoring distinct terms above `min_score` are returned.
+        """
+        words = _normalize(question).split()
+        phrases = []
+        for n in range(1, 5):
+            for i in range(len(words) - n + 1):
+                span = words[i:i + n]
+                if span[0] in STOPWORDS or span[-1] in STOPWORDS:
+                    continue
+                phrases.append(" ".join(span))
+        if not phrases:
+            return []
+
+        best = {}
+        for phrase, hits in zip(phrases, self.search(phrases, k=k)):
+            for hit in hits:
+                if hit["score"] < min_score:
+                    continue
+                key = (hit["label"], hit["term"])
+                if key not in best or hit["score"] > best[key]["score"]:
+                    best[key] = {**hit, "matched": phrase}
+        return sorted(best.values(), key=lambda hit: -hit["score"])[:k]
+
+    def save(self, path: str):
+        # Write then rename so concurrent workers never read a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            self._write(f)
+        os.replace(tmp_path, path)
+
+    def _write(self, f):
+        # Plain unicode arrays, so the file loads without allow_pickle
+        np.savez_compressed(
+            f, labels=self.labels.astype(str), ids=self.ids.astype(str),
+            terms=self.terms.astype(str), texts=self.texts.astype(str),
+            matrix=self.matrix, embedder=np.array(self.embedder.name),
+            centroids=self.centroids if self.centroids is not None else np.zeros((0, 0), np.float32),
+            assignments=self.assignments if self.assignments is not None else np.zeros(0, np.int64),
+            nprobe=np.array(self.nprobe),
+        )
+
+    @classmethod
+    def load(cls, path: str, embedder=None) -> 'VocabularyIndex':
+        data = np.load(path, allow_pickle=False)
+        embedder = embedder or get_embedder()
+        if str(data["embedder"]) != embedder.name:
+            raise ValueError(f"Index at {path} was built with {data['embedder']}, not {embedder.name}")
+        index = cls(data["labels"].tolist(), data["ids"].tolist(), data["terms"].tolist(),
+                    data["texts"].tolist(), data["matrix"], embedder)
+        if data["centroids"].size:
+            index.centroids = data["centroids"]
+            index.assignments = data["assignments"]
+            index.nprobe = int(data["nprobe"])
+        return index
+
+
+def format_resolved_terms(hits: List[Dict[str, Any]]) -> str:
+    """Render resolved vocabulary for the Cypher generation prompt"""
+    if not hits:
+        return "None resolved - fall back to case-insensitive CONTAINS matching."
+    property_of = {"Reaction": "description", "Drug": "name"}
+    lines = []
+    for hit in hits:
+        value = str(hit["term"]).replace("'", "\\'")
+        lines.append(
+            f"- \"{hit['matched']}\" -> {hit['label']}.{property_of[hit['label']]} = '{value}' (id: {hit['id']})"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Offline build: embed the vocabulary once and write it next to the engine
+    try:
+        from .service import Neo4jService
+    except ImportError:
+        from service import Neo4jService
+
+    service = Neo4jService()
+    index = VocabularyIndex.build(service)
+    nlist = int(os.getenv('VOCAB_IVF_LISTS', '0'))
+    if nlist:
+        index.train_ivf(nlist, nprobe=int(os.getenv('VOCAB_IVF_NPROBE', '4')))
+    path = os.getenv('VOCAB_INDEX_PATH', os.path.join(os.path.dirname(__file__), 'vocab_index.npz'))
+    index.save(path)
+    service.close()
+    print(f"Indexed {len(index)} terms into {path}")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Production launcher
+
+Runs `main:app` with one worker per available core. Each worker builds and
+warms its own GraphRAG engine during startup, so it only reports ready on
+/health/ready once the driver pools, metadata snapshot and templates are in
+place. On SIGTERM workers stop accepting connections, drain in-flight
+questions and close their Neo4j drivers.
+
+Uses gunicorn with uvicorn workers where available and falls back to
+uvicorn's own process manager (e.g. on Windows).
+"""
+
+import os
+import sys
+
+
+def available_cores() -> int:
+    """Cores this process may run on, honouring CPU affinity/cgroup pinning"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    return int(os.getenv('WEB_CONCURRENCY') or available_cores())
+
+
+def run_gunicorn(host: str, port: int, workers: int):
+    from gunicorn.app.base import BaseApplication
+
+    class ProductionApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Runs once in the master (preload_app): pull in the GraphRAG
+            # stack here so forked workers start with it already imported
+            from neo4j_service.graph_rag import load_dependencies
+            load_dependencies()
+            from main import app
+            return app
+
+    ProductionApplication({
+        'bind': f'{host}:{port}',
+        'workers': workers,
+        'worker_class': 'uvicorn.workers.UvicornWorker',
+        # Engines are still built per worker because driver connections
+        # must not cross a fork
+        'preload_app': True,
+        'timeout': int(os.getenv('WORKER_TIMEOUT', '120')),
+        'graceful_timeout': int(os.getenv('DRAIN_TIMEOUT', '30')) + 5,
+        'keepalive': 5,
+    }).run()
+
+
+def run_uvicorn(host: str, port: int, workers: int):
+    import uvicorn
+    uvicorn.run('main:app', host=host, port=port, workers=workers,
+                timeout_graceful_shutdown=int(os.getenv('DRAIN_TIMEOUT', '30')))
+
+
+def main():
+    host = os.getenv('HOST', '0.0.0.0')
+    port = int(os.getenv('PORT', 8000))
+    workers = worker_count()
+    print(f"Starting {workers} worker(s) on {host}:{port}")
+
+    if sys.platform != 'win32':
+        try:
+            run_gunicorn(host, port, workers)
+            return
+        except ImportError:
+            pass
+    run_uvicorn(host, port, workers)
+
+
+if __name__ == "__main__":
+    main()
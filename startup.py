@@ -5,10 +5,8 @@ import sys
 site_packages = os.path.join(os.path.dirname(__file__), 'env', 'Lib', 'site-packages')
 sys.path.insert(0, site_packages)
 
-# Import and run the FastAPI app
-from main import app
-import uvicorn
+# Run the production launcher (workers sized to the available cores, warmup before traffic)
+import serve
 
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    serve.main()
\ No newline at end of file